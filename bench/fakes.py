@@ -0,0 +1,174 @@
+import asyncio
+import itertools
+import threading
+import time
+
+from discord.opus import Encoder as OpusEncoder
+
+# The voice gateway sends one packet every 20 ms.
+FRAME_DELAY = OpusEncoder.FRAME_LENGTH / 1000
+
+_ids = itertools.count(1 << 40)
+
+class FakeMember:
+    def __init__(self, bot: bool = False):
+        self.id = next(_ids)
+        self.bot = bot
+
+class FakePermissions:
+    send_messages = True
+
+class FakeTextChannel:
+    """Text channel that records when each announcement would have been sent."""
+
+    def __init__(self, guild):
+        self.id = next(_ids)
+        self.guild = guild
+        self.sent = []
+
+    def permissions_for(self, member):
+        return FakePermissions()
+
+    async def send(self, content=None, embed=None):
+        self.sent.append((time.time(), embed.title if embed else None))
+
+class FakeVoiceClient:
+    """Voice client that drains its source on a 20 ms clock in its own thread, like ``AudioPlayer``.
+
+    A frame whose ``read()`` returns more than one frame period after its
+    deadline counts as a deadline miss. Packets are not encrypted or sent.
+    """
+
+    def __init__(self, channel):
+        self.channel = channel
+        self.guild = channel.guild
+        self.source = None
+        self.frames = 0
+        self.deadline_misses = 0
+        self._connected = True
+        self._end = threading.Event()
+        self._resumed = threading.Event()
+        self._resumed.set()
+        self._thread = None
+
+    def is_connected(self) -> bool:
+        return self._connected
+
+    def is_playing(self) -> bool:
+        return self._thread is not None and not self._end.is_set() and self._resumed.is_set()
+
+    def is_paused(self) -> bool:
+        return self._thread is not None and not self._end.is_set() and not self._resumed.is_set()
+
+    def play(self, source, after=None):
+        self.source = source
+        self._thread = threading.Thread(target=self._drain, args=(after,), name=f"bench-voice:{self.guild.id}",
+                                        daemon=True)
+        self._thread.start()
+
+    def pause(self):
+        self._resumed.clear()
+
+    def resume(self):
+        self._resumed.set()
+
+    def stop(self):
+        self._end.set()
+        self._resumed.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2)
+
+    async def disconnect(self, force: bool = False):
+        self._connected = False
+        await asyncio.to_thread(self.stop)
+
+    def _drain(self, after):
+        error = None
+        try:
+            loops = 0
+            start = time.perf_counter()
+            while not self._end.is_set():
+                if not self._resumed.is_set():
+                    self._resumed.wait()
+                    loops, start = 0, time.perf_counter()
+                    continue
+                if not self.source.read():
+                    break
+                loops += 1
+                self.frames += 1
+                next_time = start + FRAME_DELAY * loops
+                now = time.perf_counter()
+                if now > next_time + FRAME_DELAY:
+                    self.deadline_misses += 1
+                time.sleep(max(0.0, next_time - now))
+        except Exception as e:
+            error = e
+        finally:
+            if after:
+                after(error)
+            self.source.cleanup()
+
+class FakeVoiceChannel:
+    def __init__(self, guild, listeners: int = 1):
+        self.id = next(_ids)
+        self.guild = guild
+        self.name = f"bench-voice-{guild.id}"
+        self.bitrate = 64000
+        self.members = [FakeMember() for _ in range(listeners)]
+
+    async def connect(self, **kwargs):
+        voice_client = FakeVoiceClient(self)
+        self.members.append(FakeMember(bot=True))
+        return voice_client
+
+class FakeGuild:
+    def __init__(self):
+        self.id = next(_ids)
+        self.name = f"bench-guild-{self.id}"
+        self.me = FakeMember(bot=True)
+        self.voice_channel = FakeVoiceChannel(self)
+        self.text_channel = FakeTextChannel(self)
+
+    def get_channel(self, channel_id: int):
+        for channel in (self.voice_channel, self.text_channel):
+            if channel.id == channel_id:
+                return channel
+        return None
+
+class _FakeVoiceState:
+    def __init__(self, channel):
+        self.channel = channel
+
+class _FakeUser:
+    def __init__(self, channel):
+        self.id = next(_ids)
+        self.voice = _FakeVoiceState(channel)
+
+class _FakeResponse:
+    def __init__(self):
+        self.messages = []
+
+    async def defer(self, **kwargs):
+        pass
+
+    async def send_message(self, content=None, **kwargs):
+        self.messages.append(content)
+
+class _FakeFollowup:
+    def __init__(self):
+        self.messages = []
+
+    async def send(self, content=None, **kwargs):
+        self.messages.append(content)
+
+class FakeInteraction:
+    """Just enough of ``discord.Interaction`` for the slash command callbacks."""
+
+    def __init__(self, guild: FakeGuild):
+        self.guild = guild
+        self.guild_id = guild.id
+        self.channel_id = guild.text_channel.id
+        self.user = _FakeUser(guild.voice_channel)
+        self.response = _FakeResponse()
+        self.followup = _FakeFollowup()
+        self.extras = {}
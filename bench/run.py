@@ -0,0 +1,192 @@
+"""Offline load test for one bot instance.
+
+Runs the real ``RadioMonashBot`` and slash command cogs against a local looping
+stream server, a stub RadioKing API and fake voice clients, then reports CPU,
+RSS, frame-deadline misses, time to first audio frame and now-playing latency at each guild count::
+
+    python -m bench.run --guilds 1,10,100,1000 --duration 30
+
+FFmpeg and libopus must be installed, as in production.
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+
+# Keep benchmark sessions out of the real session database.
+os.environ.setdefault("RADBOT_SESSION_DB", ":memory:")
+
+import discord
+
+from bench.fakes import FakeGuild, FakeInteraction
+from bench.servers import LoopingStreamServer, StubTrackApi
+from bot.bot import RadioMonashBot
+from bot.utils import stations
+from bot.utils.logger import get_logger
+from bot.utils.metrics import process_stats
+from bot.utils.presence import broadcast_source
+
+logger = get_logger("Bench")
+
+DEFAULT_GUILD_COUNTS = "1,10,100,1000"
+DEFAULT_DURATION = 30.0
+DEFAULT_TRACK_LENGTH = 20.0
+# Time for voice threads to wind down between levels.
+SETTLE_TIME = 2.0
+
+class BenchBot(RadioMonashBot):
+    """RadioMonashBot whose guild lookups are answered by fake guilds instead of the gateway."""
+
+    def __init__(self, **options):
+        super().__init__(metrics_port=0, **options)
+        self.fake_guilds = {}
+
+    def get_guild(self, guild_id: int):
+        return self.fake_guilds.get(guild_id)
+
+    async def wait_until_ready(self):
+        pass
+
+def _cpu_seconds(bot) -> float:
+    total = process_stats(os.getpid())[0]
+    for station in bot.stations.active:
+        stats = process_stats(station.broadcast.ingest_pid)
+        if stats:
+            total += stats[0]
+    return total
+
+def _rss_bytes(bot) -> int:
+    total = process_stats(os.getpid())[1]
+    for station in bot.stations.active:
+        stats = process_stats(station.broadcast.ingest_pid)
+        if stats:
+            total += stats[1]
+    return total
+
+def _percentile(values: list, fraction: float):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+async def run_level(bot: BenchBot, api: StubTrackApi, guild_count: int, duration: float, slugs: list) -> dict:
+    """Start ``guild_count`` guilds through ``/play``, let them run, then stop them through ``/stop``."""
+    play, stop = bot.get_cog("Play"), bot.get_cog("Stop")
+    guilds = [FakeGuild() for _ in range(guild_count)]
+    for guild in guilds:
+        bot.fake_guilds[guild.id] = guild
+
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        play.play_radio.callback(play, FakeInteraction(guild), discord.app_commands.Choice(name=slug, value=slug))
+        for guild, slug in zip(guilds, slugs * (guild_count // len(slugs) + 1))
+    ))
+    join_time = time.perf_counter() - started
+    voice_clients = [bot.my_voice_clients[guild.id] for guild in guilds if guild.id in bot.my_voice_clients]
+
+    cpu_before, wall_before = _cpu_seconds(bot), time.perf_counter()
+    await asyncio.sleep(duration)
+    cpu = _cpu_seconds(bot) - cpu_before
+    wall = time.perf_counter() - wall_before
+    rss = _rss_bytes(bot)
+
+    frames = sum(client.frames for client in voice_clients)
+    misses = sum(client.deadline_misses for client in voice_clients)
+    concealed = sum(getattr(client.source, "frames_concealed", 0) for client in voice_clients)
+    first_frames = [
+        broadcast_source(client).first_frame_delay for client in voice_clients
+        if getattr(broadcast_source(client), "first_frame_delay", None) is not None
+    ]
+    latencies = [
+        sent_at - api.change_times[title]
+        for guild in guilds for sent_at, title in guild.text_channel.sent if title in api.change_times
+    ]
+
+    for guild in guilds:
+        await stop.stop_radio.callback(stop, FakeInteraction(guild))
+        bot.fake_guilds.pop(guild.id, None)
+    await asyncio.sleep(SETTLE_TIME)
+
+    return {
+        "guilds": guild_count,
+        "connected": len(voice_clients),
+        "join_seconds": join_time,
+        "cpu_percent": 100 * cpu / wall,
+        "rss_mb": rss / (1 << 20),
+        "frames": frames,
+        "deadline_miss_percent": 100 * misses / frames if frames else None,
+        "concealed_percent": 100 * concealed / frames if frames else None,
+        "first_frame_p50": _percentile(first_frames, 0.5),
+        "first_frame_max": max(first_frames) if first_frames else None,
+        "notifications": len(latencies),
+        "notify_p50": _percentile(latencies, 0.5),
+        "notify_p95": _percentile(latencies, 0.95),
+        "notify_max": max(latencies) if latencies else None,
+    }
+
+def _format(value, spec: str) -> str:
+    return "n/a" if value is None else format(value, spec)
+
+def print_report(results: list):
+    print(f"{'guilds':>7} {'joined':>7} {'join s':>7} {'CPU %':>7} {'RSS MB':>7} {'miss %':>7} "
+          f"{'conceal %':>9} {'1st frame':>9} {'max':>7} {'notify p50':>10} {'p95':>7} {'max':>7}")
+    for row in results:
+        print(f"{row['guilds']:>7} {row['connected']:>7} {row['join_seconds']:>7.2f} {row['cpu_percent']:>7.1f} "
+              f"{row['rss_mb']:>7.1f} {_format(row['deadline_miss_percent'], '>7.2f')} "
+              f"{_format(row['concealed_percent'], '>9.2f')} {_format(row['first_frame_p50'], '>9.2f')} "
+              f"{_format(row['first_frame_max'], '>7.2f')} {_format(row['notify_p50'], '>10.2f')} "
+              f"{_format(row['notify_p95'], '>7.2f')} {_format(row['notify_max'], '>7.2f')}")
+
+async def main(args):
+    if not discord.opus.is_loaded():
+        try:
+            discord.opus._load_default()
+        except Exception:
+            pass
+        if not discord.opus.is_loaded():
+            logger.warning("libopus is not loaded; Opus encoding will fail and every frame will be concealed")
+    audio = None
+    if args.audio:
+        with open(args.audio, "rb") as f:
+            audio = f.read()
+    stream = LoopingStreamServer(audio, args.bitrate)
+    api = StubTrackApi(args.track_length)
+    await stream.start()
+    await api.start()
+    stations.STREAM_URL_TEMPLATE = stream.url_template
+    stations.API_URL_TEMPLATE = api.url_template
+    slugs = [slug for slug in args.stations.split(",") if slug]
+    os.environ["RADBOT_STATIONS"] = ",".join(slugs)
+
+    bot = BenchBot()
+    await bot.setup_hook()
+    slugs = [slug for slug in slugs if slug in bot.stations] or [bot.stations.default]
+    results = []
+    try:
+        for guild_count in (int(count) for count in args.guilds.split(",")):
+            logger.info(f"Benchmarking {guild_count} guild(s) for {args.duration:.0f}s")
+            results.append(await run_level(bot, api, guild_count, args.duration, slugs))
+    finally:
+        await bot.close()
+        await stream.close()
+        await api.close()
+    print_report(results)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Offline load test for the Radio Monash bot")
+    parser.add_argument("--guilds", default=DEFAULT_GUILD_COUNTS, help="comma-separated guild counts to run")
+    parser.add_argument("--duration", type=float, default=DEFAULT_DURATION, help="seconds to run each level")
+    parser.add_argument("--track-length", type=float, default=DEFAULT_TRACK_LENGTH,
+                        help="seconds between scripted track changes")
+    parser.add_argument("--stations", default="radio-monash", help="comma-separated station slugs to spread guilds over")
+    parser.add_argument("--audio", help="audio file to loop (defaults to a generated WAV tone)")
+    parser.add_argument("--bitrate", type=int, help="bitrate in kbit/s used to pace a non-WAV --audio file")
+    parser.add_argument("--json", help="also write the results to this file")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
@@ -0,0 +1,165 @@
+import asyncio
+import io
+import math
+import struct
+import time
+import wave
+from datetime import datetime, timedelta, timezone
+
+from aiohttp import web
+
+from bot.utils.logger import get_logger
+
+logger = get_logger("BenchServers")
+
+SAMPLE_RATE = 48000
+CHANNELS = 2
+SAMPLE_WIDTH = 2
+# Audio is written in chunks of this many seconds, paced to real time.
+CHUNK_SECONDS = 0.1
+
+def sine_wav(seconds: float = 10.0, frequency: float = 440.0, amplitude: float = 0.3) -> bytes:
+    """Generate a loopable stereo 48 kHz test tone as a WAV file."""
+    frames = int(SAMPLE_RATE * seconds)
+    # Whole cycles only, so the loop point does not click.
+    frames -= frames % int(SAMPLE_RATE / math.gcd(SAMPLE_RATE, int(frequency)))
+    peak = int(32767 * amplitude)
+    samples = bytearray()
+    for index in range(frames):
+        value = int(peak * math.sin(2 * math.pi * frequency * index / SAMPLE_RATE))
+        samples += struct.pack("<hh", value, value)
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(CHANNELS)
+        wav.setsampwidth(SAMPLE_WIDTH)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes(bytes(samples))
+    return buffer.getvalue()
+
+def _split_wav(data: bytes):
+    """Return the header to send once, the PCM body to loop and its byte rate."""
+    with wave.open(io.BytesIO(data)) as wav:
+        byte_rate = wav.getframerate() * wav.getnchannels() * wav.getsampwidth()
+        body = wav.readframes(wav.getnframes())
+    # Rewrite the header with maximal sizes so FFmpeg treats the stream as endless.
+    header = bytearray(data[:len(data) - len(body)])
+    header[4:8] = struct.pack("<I", 0xFFFFFFFF)
+    header[-4:] = struct.pack("<I", 0xFFFFFFFF)
+    return bytes(header), body, byte_rate
+
+class LoopingStreamServer:
+    """Serve an audio file forever at real-time pace, standing in for ``play.radioking.io``.
+
+    WAV files are paced by their own byte rate; any other format needs
+    ``bitrate`` (in kbit/s). Every station slug gets the same audio.
+    """
+
+    def __init__(self, audio: bytes = None, bitrate: int = None, host: str = "127.0.0.1", port: int = 0):
+        audio = audio or sine_wav()
+        if audio[:4] == b"RIFF":
+            self.header, self.body, self.byte_rate = _split_wav(audio)
+        elif bitrate:
+            self.header, self.body, self.byte_rate = b"", audio, bitrate * 1000 // 8
+        else:
+            raise ValueError("a bitrate is required to pace audio that is not WAV")
+        self.host = host
+        self.port = port
+        self.connections = 0
+        self._runner = None
+
+    @property
+    def url_template(self) -> str:
+        return f"http://{self.host}:{self.port}/{{slug}}"
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/{slug}", self._stream)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        self.port = self._runner.addresses[0][1]
+        logger.info(f"Looping stream server on {self.url_template}")
+
+    async def close(self):
+        if self._runner:
+            await self._runner.cleanup()
+
+    async def _stream(self, request):
+        response = web.StreamResponse(headers={"Content-Type": "audio/wav" if self.header else "audio/mpeg"})
+        await response.prepare(request)
+        self.connections += 1
+        chunk_size = int(self.byte_rate * CHUNK_SECONDS)
+        chunk_size -= chunk_size % (CHANNELS * SAMPLE_WIDTH)
+        position = 0
+        started = time.perf_counter()
+        sent = 0
+        try:
+            await response.write(self.header)
+            while True:
+                end = position + chunk_size
+                chunk = self.body[position:end]
+                if end > len(self.body):
+                    end -= len(self.body)
+                    chunk += self.body[:end]
+                position = end
+                await response.write(chunk)
+                sent += len(chunk)
+                # Stay slightly ahead of real time, as a live server's send buffer would.
+                await asyncio.sleep(max(0.0, started + sent / self.byte_rate - CHUNK_SECONDS - time.perf_counter()))
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self.connections -= 1
+        return response
+
+class StubTrackApi:
+    """Serve RadioKing-shaped ``/track/current`` payloads that change every ``track_length`` seconds.
+
+    ``change_times`` maps each track's title to the wall-clock time it started,
+    which is what notification latency is measured against.
+    """
+
+    def __init__(self, track_length: float = 30.0, host: str = "127.0.0.1", port: int = 0):
+        self.track_length = track_length
+        self.host = host
+        self.port = port
+        self.requests = 0
+        self.change_times = {}
+        self._epoch = None
+        self._runner = None
+
+    @property
+    def url_template(self) -> str:
+        return f"http://{self.host}:{self.port}/widget/radio/{{slug}}"
+
+    async def start(self):
+        self._epoch = time.time()
+        app = web.Application()
+        app.router.add_get("/widget/radio/{slug}/track/current", self._current)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        self.port = self._runner.addresses[0][1]
+        logger.info(f"Stub track API on {self.url_template}")
+
+    async def close(self):
+        if self._runner:
+            await self._runner.cleanup()
+
+    def current(self, slug: str) -> dict:
+        index = int((time.time() - self._epoch) // self.track_length)
+        started = self._epoch + index * self.track_length
+        title = f"Bench Track {index}"
+        self.change_times.setdefault(title, started)
+        return {
+            "title": title,
+            "artist": f"{slug} Bench Artist",
+            "album": "Benchmarks",
+            "duration": self.track_length,
+            "started_at": datetime.fromtimestamp(started, timezone.utc).isoformat(),
+            "end_at": (datetime.fromtimestamp(started, timezone.utc) + timedelta(seconds=self.track_length)).isoformat(),
+        }
+
+    async def _current(self, request):
+        self.requests += 1
+        return web.json_response(self.current(request.match_info["slug"]))
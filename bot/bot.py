@@ -1,33 +1,92 @@
 import discord
 from discord import app_commands
-from discord.ext import commands, tasks
-import aiohttp
+from discord.ext import commands
 import asyncio
+import hashlib
+import json
+import os
+import time
 
+from bot.utils.broadcast import CONCEAL_REPEAT, DEFAULT_VOLUME, TARGET_DEPTH, bitrate_tier
 from bot.utils.logger import get_logger
+from bot.utils.metadata import create_http_session
+from bot.utils.metrics import DEFAULT_PORT as DEFAULT_METRICS_PORT, BotMetrics
+from bot.utils.notifier import NowPlayingDispatcher
+from bot.utils.presence import ListenerMonitor, broadcast_source
+from bot.utils.sessions import SessionStore, resume_sessions
+from bot.utils.stations import StationRegistry, load_stations
 
 logger = get_logger("RadioMonashBot")
 
+EXTENSIONS = (
+    "bot.commands.play",
+    "bot.commands.stop",
+    "bot.commands.track",
+    "bot.commands.history",
+    "bot.commands.volume",
+    "bot.commands.help_cmd",
+)
+
+class RadioCommandTree(app_commands.CommandTree):
+    """Command tree that times every slash command for the metrics endpoint."""
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        interaction.extras["started_at"] = time.perf_counter()
+        return True
+
+    async def on_error(self, interaction: discord.Interaction, error: app_commands.AppCommandError):
+        self.client.record_command(interaction, failed=True)
+        await super().on_error(interaction, error)
+
 class RadioMonashBot(commands.Bot):
-    def __init__(self):
+    def __init__(self, track_feed=None, sync_commands=True, metrics_port=None, **options):
         intents = discord.Intents.default()
         intents.message_content = True
         intents.voice_states = True
-        super().__init__(command_prefix="!", intents=intents)
+        super().__init__(command_prefix="!", intents=intents, tree_cls=RadioCommandTree, **options)
 
-        self.radio_stream_url = "https://play.radioking.io/radio-monash"
-        self.api_base_url = "https://api.radioking.io/widget/radio/radio-monash"
+        # Set RADBOT_ENCODE_WORKERS to move audio encoding into that many worker processes per station.
+        # RADBOT_JITTER_FRAMES is how many 20 ms frames new listeners start behind the live edge, and
+        # RADBOT_CONCEAL ("repeat" or "silence") how gaps in the stream are filled.
+        self.stations = StationRegistry(
+            load_stations(), self.on_track_change,
+            encode_workers=int(os.getenv("RADBOT_ENCODE_WORKERS", "0")), track_feed=track_feed,
+            target_depth=int(os.getenv("RADBOT_JITTER_FRAMES", TARGET_DEPTH)),
+            conceal=os.getenv("RADBOT_CONCEAL", CONCEAL_REPEAT).lower()
+        )
         self.my_voice_clients = {}
-        self.current_track_info = None
+        self.play_channels = {}
+        self.http_session = None
+        self.notifier = NowPlayingDispatcher()
+        # Serves /metrics on localhost; set RADBOT_METRICS_PORT to 0 to disable the endpoint.
+        if metrics_port is None:
+            metrics_port = int(os.getenv("RADBOT_METRICS_PORT", DEFAULT_METRICS_PORT))
+        self.metrics = BotMetrics(self, port=metrics_port)
+        self.sync_commands = sync_commands
+        self.sessions = SessionStore()
+        self.listener_monitor = ListenerMonitor(self)
+        self.resume_report = None
+        self.started_at = time.monotonic()
+        self.time_to_ready = None
+        self._resume_task = None
+        self._closing = False
 
     async def setup_hook(self):
+        self.http_session = create_http_session()
+        self.stations.open(self.http_session)
+        await self.metrics.start()
         # Load commands from the commands folder.
-        await self.load_extension("bot.commands.play")
-        await self.load_extension("bot.commands.stop")
-        await self.load_extension("bot.commands.track")
-        await self.load_extension("bot.commands.volume")
-        await self.load_extension("bot.commands.help_cmd")
-        self.track_update_task.start()
+        await asyncio.gather(*(self.load_extension(name) for name in EXTENSIONS))
+
+    async def close(self):
+        # Voice disconnects during shutdown must not erase the sessions we resume from.
+        self._closing = True
+        self.stations.close()
+        await self.metrics.close()
+        await super().close()
+        if self.http_session:
+            await self.http_session.close()
+        self.sessions.close()
 
     async def on_ready(self):
         logger.info(f"Logged in as {self.user} (ID: {self.user.id})")
@@ -36,81 +95,163 @@ class RadioMonashBot(commands.Bot):
             type=discord.ActivityType.streaming,
             name="Radio Monash"
         ))
+        # on_ready fires again after gateway reconnects; only the first one is the boot.
+        if self.time_to_ready is not None:
+            return
+        if self.sync_commands:
+            await self._sync_commands()
+        self.time_to_ready = time.monotonic() - self.started_at
+        logger.info(f"Ready in {self.time_to_ready:.2f}s")
+        if self._resume_task is None:
+            self._resume_task = asyncio.create_task(self._resume_sessions())
+
+    def command_tree_hash(self) -> str:
+        """Hash of the application commands as they would be sent to Discord."""
+        payload = []
+        for command in self.tree.get_commands():
+            try:
+                payload.append(command.to_dict(self.tree))
+            except TypeError:
+                payload.append(command.to_dict())
+        data = json.dumps([self.application_id, payload], sort_keys=True, default=str)
+        return hashlib.sha256(data.encode()).hexdigest()
+
+    async def _sync_commands(self):
+        """Sync application commands only when they changed since the last successful sync."""
+        tree_hash = self.command_tree_hash()
+        if await self.sessions.get_meta("command_tree_hash") == tree_hash:
+            logger.info("Application commands unchanged, skipping sync")
+            return
         try:
             synced = await self.tree.sync()
+            await self.sessions.set_meta("command_tree_hash", tree_hash)
             logger.info(f"Synced {len(synced)} command(s)")
         except Exception as e:
             logger.error(f"Failed to sync commands: {e}")
 
-    @tasks.loop(minutes=1)
-    async def track_update_task(self):
-        """Periodically update the current track information and notify active channels."""
-        try:
-            new_track = await self.fetch_current_track()
-            if (self.current_track_info and new_track and 
-                self.current_track_info.get('title') != new_track.get('title') and
-                self.my_voice_clients):
-                for guild_id, voice_client in self.my_voice_clients.items():
-                    guild = self.get_guild(guild_id)
-                    if guild and voice_client.is_connected():
-                        play_channel_id = self.play_channels.get(guild_id)
-                        if play_channel_id:
-                            channel = guild.get_channel(play_channel_id)
-                            if channel.permissions_for(guild.me).send_messages:
-                                embed = self.create_track_embed(new_track)
-                                await channel.send("🎵 Now playing:", embed=embed)
-                                break
-            self.current_track_info = new_track
-        except Exception as e:
-            logger.error(f"Error in track update task: {e}")
+    async def _resume_sessions(self):
+        """Reconnect the sessions stored before the last restart."""
+        self.resume_report = await resume_sessions(self, self.sessions)
 
-    @track_update_task.before_loop
-    async def before_track_update(self):
-        await self.wait_until_ready()
+    def owns_guild(self, guild_id: int) -> bool:
+        """Whether this process is responsible for ``guild_id``."""
+        return True
 
-    async def fetch_current_track(self):
-        """Fetch current track information from Radio Monash API."""
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(f"{self.api_base_url}/track/current") as response:
-                    if response.status == 200:
-                        return await response.json()
-                    else:
-                        logger.error(f"API returned status {response.status}")
-                        return None
-        except Exception as e:
-            logger.error(f"Error fetching track data: {e}")
-            return None
+    def record_command(self, interaction: discord.Interaction, failed: bool = False):
+        """Record how long a slash command took to handle."""
+        started = interaction.extras.get("started_at")
+        if started is not None and interaction.command is not None:
+            self.metrics.observe_command(interaction.command.qualified_name, time.perf_counter() - started, failed)
+
+    async def on_app_command_completion(self, interaction: discord.Interaction, command):
+        self.record_command(interaction)
 
-    def create_track_embed(self, track_data):
-        """Create a rich embed for track information."""
-        if not track_data:
-            return None
+    async def start_playback(self, voice_channel, text_channel_id, volume=DEFAULT_VOLUME, station=None,
+                             started_at=None):
+        """Connect to a voice channel, attach it to a station's shared broadcast and record the session.
 
-        embed = discord.Embed(
-            title=track_data.get('title', 'Unknown Title'),
-            color=0x9370DB
+        The station's ingest is warmed before the voice handshake starts, so the
+        new listener begins from frames that are already buffered.
+        """
+        started_at = started_at or time.perf_counter()
+        station = self.stations[station or self.stations.default]
+        guild_id = voice_channel.guild.id
+        self.stations.join(guild_id, station.key)
+        station.broadcast.warm()
+        try:
+            voice_client = await voice_channel.connect()
+        except Exception:
+            self.stations.leave(guild_id)
+            raise
+        self.my_voice_clients[guild_id] = voice_client
+        audio_source = station.broadcast.create_source(volume, bitrate_tier(voice_channel.bitrate))
+        audio_source.started_at = started_at
+        audio_source.on_first_frame = lambda delay: self.metrics.observe_first_frame(guild_id, delay)
+        if not audio_source.is_opus():
+            audio_source = discord.PCMVolumeTransformer(audio_source, volume=volume)
+        voice_client.play(
+            audio_source,
+            after=lambda e: logger.error(f"Player error: {e}") if e else None
         )
-        embed.set_author(name="Radio Monash")
-        embed.add_field(name="Artist", value=track_data.get('artist', 'Unknown Artist'), inline=True)
-        if track_data.get('album'):
-            embed.add_field(name="Album", value=track_data.get('album'), inline=True)
-        duration = track_data.get('duration', 0)
-        if duration:
-            minutes = int(duration) // 60
-            seconds = int(duration) % 60
-            embed.add_field(name="Duration", value=f"{minutes}:{seconds:02d}", inline=True)
-        if track_data.get('cover'):
-            embed.set_thumbnail(url=track_data.get('cover'))
-        if track_data.get('buy_link'):
-            embed.add_field(name="Stream/Buy", value=f"[Listen Online]({track_data.get('buy_link')})", inline=False)
-        embed.set_footer(text="Tune in radiomonash.online")
-        return embed
+        self.apply_channel_bitrate(voice_client)
+        self.play_channels[guild_id] = text_channel_id
+        self.listener_monitor.update(voice_channel.guild)
+        await self.sessions.save(guild_id, voice_channel.id, text_channel_id, volume, station.key)
+        return voice_client
+
+    def apply_channel_bitrate(self, voice_client):
+        """Move a guild onto the encode tier that matches its voice channel's bitrate."""
+        source = broadcast_source(voice_client)
+        if voice_client.channel is None or not hasattr(source, "bitrate"):
+            return
+        tier = bitrate_tier(voice_client.channel.bitrate)
+        if source.bitrate != tier:
+            logger.info(f"Voice channel bitrate in guild {voice_client.guild.id} is now "
+                        f"{voice_client.channel.bitrate // 1000} kbps, encoding at {tier} kbps")
+        source.bitrate = tier
+        # PCM listeners are encoded by discord.py's per-client encoder.
+        encoder = getattr(voice_client, "encoder", None)
+        if not source.is_opus() and hasattr(encoder, "set_bitrate"):
+            encoder.set_bitrate(tier)
+
+    def release_guild(self, guild_id: int):
+        """Forget a guild's playback state and unsubscribe it from its station."""
+        self.my_voice_clients.pop(guild_id, None)
+        self.play_channels.pop(guild_id, None)
+        self.stations.leave(guild_id)
+
+    async def on_track_change(self, station, previous, new_track):
+        """Announce a station's new track to the channels listening to it when it replaces another."""
+        rendered = station.get_rendered_track(new_track)
+        if not previous or not station.guilds:
+            return
+        await self.wait_until_ready()
+        channels = []
+        for guild_id in station.guilds:
+            guild = self.get_guild(guild_id)
+            voice_client = self.my_voice_clients.get(guild_id)
+            if guild and voice_client and voice_client.is_connected():
+                channel = guild.get_channel(self.play_channels.get(guild_id, 0))
+                if channel and channel.permissions_for(guild.me).send_messages:
+                    channels.append(channel)
+        if channels:
+            self.notifier.dispatch(channels, "🎵 Now playing:", rendered.track_embed, key=station.key)
+
+    def get_cached_track(self, guild_id: int = None):
+        """Return the latest known track of a guild's station without waiting on the API."""
+        return self.stations.for_guild(guild_id).get_cached_track()
+
+    def get_rendered_track(self, guild_id: int = None):
+        """Return the prebuilt embeds for the current track of a guild's station."""
+        return self.stations.for_guild(guild_id).get_rendered_track()
 
     async def on_voice_state_update(self, member, before, after):
-        """Handle voice state updates to detect when bot is disconnected."""
+        """Handle voice state updates to detect disconnects and track human listeners."""
         if member.id == self.user.id and before.channel and not after.channel:
             guild_id = before.channel.guild.id
+            self.listener_monitor.forget(guild_id)
             if guild_id in self.my_voice_clients:
-                del self.my_voice_clients[guild_id]
+                self.release_guild(guild_id)
+                if not self._closing:
+                    await self.sessions.remove(guild_id)
                 logger.info(f"Bot was disconnected from voice in guild {guild_id}")
+        elif before.channel != after.channel and member.guild.id in self.my_voice_clients:
+            if member.id == self.user.id:
+                # The bot was moved; the new channel may allow a different bitrate.
+                self.apply_channel_bitrate(self.my_voice_clients[member.guild.id])
+            self.listener_monitor.update(member.guild)
+
+    async def on_guild_channel_update(self, before, after):
+        """Re-select the encode tier when the bitrate of a channel we play in changes."""
+        voice_client = self.my_voice_clients.get(after.guild.id)
+        if (voice_client and voice_client.channel and voice_client.channel.id == after.id
+                and getattr(before, "bitrate", None) != getattr(after, "bitrate", None)):
+            self.apply_channel_bitrate(voice_client)
+
+class ShardedRadioMonashBot(RadioMonashBot, commands.AutoShardedBot):
+    """RadioMonashBot running a set of gateway shards, used by the cluster launcher in ``main.py``."""
+
+    def owns_guild(self, guild_id: int) -> bool:
+        if self.shard_count is None or self.shard_ids is None:
+            return True
+        return (guild_id >> 22) % self.shard_count in self.shard_ids
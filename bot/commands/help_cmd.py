@@ -18,10 +18,11 @@ class HelpCmd(commands.Cog):
             description="Listen to Radio Monash directly in your Discord server!",
             color=0x9370DB
         )
-        embed.add_field(name="/play", value="Play Radio Monash in your voice channel", inline=False)
+        embed.add_field(name="/play [station]", value="Play Radio Monash or another station in your voice channel", inline=False)
         embed.add_field(name="/stop", value="Stop the radio stream and disconnect the bot", inline=False)
         embed.add_field(name="/track", value="Show detailed information about the current track", inline=False)
-        embed.add_field(name="/volume <level>", value="Adjust the volume (0-100)", inline=False)
+        embed.add_field(name="/history [page] [station]", value="Show the tracks that were played recently", inline=False)
+        embed.add_field(name="/volume <level>", value="Adjust the volume (0-100, in steps of 10)", inline=False)
         embed.set_footer(text="Radio Monash - Tune in anytime!")
         await interaction.response.send_message(embed=embed)
         logger.info(f"Help command used in {interaction.guild.name}")
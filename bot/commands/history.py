@@ -0,0 +1,30 @@
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from bot.bot import RadioMonashBot
+from bot.utils.logger import get_logger
+from bot.utils.stations import load_stations
+
+logger = get_logger("HistoryCommand")
+
+STATION_CHOICES = [app_commands.Choice(name=config.name, value=key) for key, config in load_stations().items()]
+
+class History(commands.Cog):
+    def __init__(self, bot: RadioMonashBot):
+        self.bot = bot
+
+    @app_commands.command(name="history", description="Show the tracks that were played recently")
+    @app_commands.describe(page="Page of history to show, newest first", station="Station to show (defaults to the one playing)")
+    @app_commands.choices(station=STATION_CHOICES)
+    async def history(self, interaction: discord.Interaction, page: app_commands.Range[int, 1] = 1,
+                      station: app_commands.Choice[str] = None):
+        if station and station.value in self.bot.stations:
+            selected = self.bot.stations[station.value]
+        else:
+            selected = self.bot.stations.for_guild(interaction.guild_id)
+        await interaction.response.send_message(embed=selected.history.page(page))
+        logger.info(f"Sent {selected.key} history page {page} in {interaction.guild.name}")
+
+async def setup(bot: RadioMonashBot):
+    await bot.add_cog(History(bot))
@@ -5,16 +5,23 @@ import asyncio
 
 from bot.bot import RadioMonashBot
 from bot.utils.logger import get_logger
+from bot.utils.stations import load_stations
 
 logger = get_logger("PlayCommand")
 
+# How long the reply waits on track metadata that was not already cached.
+METADATA_TIMEOUT = 2.0
+
+STATION_CHOICES = [app_commands.Choice(name=config.name, value=key) for key, config in load_stations().items()]
+
 class Play(commands.Cog):
     def __init__(self, bot: RadioMonashBot):
         self.bot = bot
-        self.play_channels = {}
 
-    @app_commands.command(name="play", description="Play Radio Monash in your voice channel")
-    async def play_radio(self, interaction: discord.Interaction):
+    @app_commands.command(name="play", description="Play Radio Monash or another station in your voice channel")
+    @app_commands.describe(station="Station to play (defaults to Radio Monash)")
+    @app_commands.choices(station=STATION_CHOICES)
+    async def play_radio(self, interaction: discord.Interaction, station: app_commands.Choice[str] = None):
         if not interaction.user.voice:
             await interaction.response.send_message("You need to join a voice channel first!", ephemeral=True)
             return
@@ -24,37 +31,33 @@ class Play(commands.Cog):
             await interaction.response.send_message("I'm already playing in a voice channel!", ephemeral=True)
             return
 
-        await interaction.response.defer()
+        key = station.value if station else self.bot.stations.default
+        if key not in self.bot.stations:
+            await interaction.response.send_message("That station is no longer available.", ephemeral=True)
+            return
+
+        # Defer, connect to voice and look up the current track at the same time.
+        station = self.bot.stations[key]
+        track = asyncio.ensure_future(station.fetch_track())
+        deferred, playback = await asyncio.gather(
+            interaction.response.defer(),
+            self.bot.start_playback(voice_channel, interaction.channel_id, station=key,
+                                    started_at=interaction.extras.get("started_at")),
+            return_exceptions=True
+        )
+        if isinstance(deferred, Exception):
+            logger.error(f"Failed to defer play command: {deferred}")
+            return
         try:
-            voice_client = await voice_channel.connect()
-            self.bot.my_voice_clients[guild_id] = voice_client
-            audio_source = discord.FFmpegPCMAudio(
-                self.bot.radio_stream_url,
-                before_options="-reconnect 1 -reconnect_streamed 1 -reconnect_delay_max 5"
-            )
-            voice_client.play(
-                discord.PCMVolumeTransformer(audio_source, volume=0.5),
-                after=lambda e: logger.error(f"Player error: {e}") if e else None
-            )
-            track = self.bot.current_track_info or await self.bot.fetch_current_track()
-            embed = discord.Embed(
-                title="📻 Radio Monash Now Playing",
-                description=f"Connected to **{voice_channel.name}**",
-                color=0x9370DB
-            )
-            if track:
-                embed.add_field(
-                    name="Current Track",
-                    value=f"**{track.get('artist', 'Unknown Artist')}** - **{track.get('title', 'Unknown Title')}**",
-                    inline=False
-                )
-                if track.get('cover'):
-                    embed.set_thumbnail(url=track.get('cover'))
-            embed.set_footer(text="Use /stop to disconnect | /track for detailed track info")
-            await interaction.followup.send(embed=embed)
-            logger.info(f"Started playing Radio Monash in {interaction.guild.name} - {voice_channel.name}")
-
-            self.play_channels[guild_id] = interaction.channel_id
+            if isinstance(playback, Exception):
+                raise playback
+            try:
+                track_data = await asyncio.wait_for(asyncio.shield(track), METADATA_TIMEOUT)
+            except asyncio.TimeoutError:
+                track_data = None
+            rendered = station.get_rendered_track(track_data)
+            await interaction.followup.send(f"Connected to **{voice_channel.name}**", embed=rendered.play_embed)
+            logger.info(f"Started playing {key} in {interaction.guild.name} - {voice_channel.name}")
         except Exception as e:
             logger.error(f"Error in play command: {e}")
             await interaction.followup.send(f"Error: Unable to play radio stream. {str(e)}", ephemeral=True)
@@ -24,8 +24,8 @@ class Stop(commands.Cog):
                     voice_client.stop()
 
                 await voice_client.disconnect()
-                if guild_id in self.bot.my_voice_clients:
-                    del self.bot.my_voice_clients[guild_id]
+                self.bot.release_guild(guild_id)
+                await self.bot.sessions.remove(guild_id)
                 await interaction.followup.send("⏹️ Radio stream stopped and disconnected.")
             else:
                 await interaction.followup.send(
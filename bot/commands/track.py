@@ -13,10 +13,9 @@ class Track(commands.Cog):
 
     @app_commands.command(name="track", description="Show detailed information about the current track")
     async def track_info(self, interaction: discord.Interaction):
-        track = self.bot.current_track_info or await self.bot.fetch_current_track()
-        if track:
-            embed = self.bot.create_track_embed(track)
-            await interaction.response.send_message(embed=embed)
+        rendered = self.bot.get_rendered_track(interaction.guild_id)
+        if rendered.track_embed:
+            await interaction.response.send_message(embed=rendered.track_embed)
             logger.info(f"Sent track info in {interaction.guild.name}")
         else:
             await interaction.response.send_message("Unable to fetch current track information. Please try again later.", ephemeral=True)
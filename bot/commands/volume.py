@@ -3,6 +3,7 @@ from discord import app_commands
 from discord.ext import commands
 
 from bot.bot import RadioMonashBot
+from bot.utils.broadcast import snap_volume_level
 from bot.utils.logger import get_logger
 
 logger = get_logger("VolumeCommand")
@@ -11,7 +12,7 @@ class Volume(commands.Cog):
     def __init__(self, bot: RadioMonashBot):
         self.bot = bot
 
-    @app_commands.command(name="volume", description="Adjust the volume of the radio stream (0-100)")
+    @app_commands.command(name="volume", description="Adjust the volume of the radio stream (0-100, in steps of 10)")
     @app_commands.describe(level="Volume level between 0 and 100")
     async def set_volume(self, interaction: discord.Interaction, level: int):
         if not 0 <= level <= 100:
@@ -21,11 +22,13 @@ class Volume(commands.Cog):
         if guild_id not in self.bot.my_voice_clients or not self.bot.my_voice_clients[guild_id].is_connected():
             await interaction.response.send_message("I'm not currently playing in a voice channel.", ephemeral=True)
             return
+        level = snap_volume_level(level)
         volume = level / 100
         voice_client = self.bot.my_voice_clients[guild_id]
         if hasattr(voice_client.source, 'volume'):
             voice_client.source.volume = volume
             await interaction.response.send_message(f"🔊 Volume set to {level}%")
+            await self.bot.sessions.update_volume(guild_id, volume)
             logger.info(f"Volume set to {level}% in {interaction.guild.name}")
         else:
             await interaction.response.send_message("Unable to adjust volume for the current stream.", ephemeral=True)
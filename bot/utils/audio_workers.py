@@ -0,0 +1,144 @@
+import audioop
+import multiprocessing
+import time
+
+from discord.opus import Encoder as OpusEncoder
+
+from bot.utils.logger import get_logger
+from bot.utils.ringbuffer import SharedFrameRing
+
+logger = get_logger("EncoderPool")
+
+# How long an idle worker sleeps between checks for new PCM frames.
+POLL_INTERVAL = 0.002
+IDLE_POLL_INTERVAL = 0.05
+# Minimum time between respawns of the same worker, so one that cannot start does not spin.
+RESPAWN_INTERVAL = 5.0
+
+def _worker_main(pcm_name: str, slots: int, control):
+    """Scale and Opus-encode shared PCM frames for the (volume, bitrate) streams assigned to this worker."""
+    pcm = SharedFrameRing(slots, OpusEncoder.FRAME_SIZE, name=pcm_name)
+    outputs = {}
+    position = pcm.head
+    frame = None
+    try:
+        while True:
+            while control.poll():
+                message = control.recv()
+                if message[0] == "add":
+                    _, key, ring_name, ring_slots, slot_size = message
+                    outputs[key] = (SharedFrameRing(ring_slots, slot_size, name=ring_name), OpusEncoder(bitrate=key[1]))
+                elif message[0] == "remove":
+                    ring, _ = outputs.pop(message[1], (None, None))
+                    if ring:
+                        ring.close()
+                elif message[0] == "stop":
+                    return
+            head = pcm.head
+            if position >= head:
+                time.sleep(POLL_INTERVAL if outputs else IDLE_POLL_INTERVAL)
+                continue
+            if position < pcm.oldest or not outputs:
+                # Fell behind or had nothing to do; rejoin at the newest frame.
+                position = head - 1
+            frame = pcm.read(position)
+            for (volume, _), (ring, encoder) in outputs.items():
+                scaled = audioop.mul(frame, 2, min(volume, 2.0)) if volume != 1.0 else bytes(frame)
+                ring.write(encoder.encode(scaled, OpusEncoder.SAMPLES_PER_FRAME))
+            position += 1
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        # Drop our view into the PCM ring so its mapping can be closed.
+        frame = None
+        for ring, _ in outputs.values():
+            ring.close()
+        pcm.close()
+
+class EncoderPool:
+    """Worker processes that turn the shared PCM ring into per-volume, per-bitrate Opus rings.
+
+    Scaling and encoding happen outside the bot's process, so they no longer
+    compete with the gateway event loop for the GIL. Each ``(volume, bitrate)``
+    stream is assigned to the least-loaded worker; the main process only reads
+    finished packets. :meth:`check` respawns workers that have exited and
+    reassigns their streams.
+    """
+
+    def __init__(self, workers: int, pcm_ring: SharedFrameRing):
+        self.pcm_ring = pcm_ring
+        self.respawns = 0
+        self._context = multiprocessing.get_context("spawn")
+        self._workers = [[*self._spawn(index), 0] for index in range(workers)]
+        self._assignments = {}
+        self._rings = {}
+        self._spawned_at = [time.monotonic()] * workers
+        logger.info(f"Started {workers} encoder worker process(es)")
+
+    def _spawn(self, index: int):
+        parent, child = self._context.Pipe()
+        process = self._context.Process(
+            target=_worker_main, args=(self.pcm_ring.name, self.pcm_ring.slots, child),
+            name=f"radio-encoder-{index}", daemon=True
+        )
+        process.start()
+        return process, parent
+
+    @property
+    def pids(self) -> list:
+        return [process.pid for process, _, _ in self._workers]
+
+    def add(self, key: tuple, ring: SharedFrameRing):
+        worker = min(self._workers, key=lambda w: w[2])
+        worker[2] += 1
+        self._assignments[key] = worker
+        self._rings[key] = ring
+        self._send(worker, ("add", key, ring.name, ring.slots, ring.slot_size))
+
+    def remove(self, key: tuple):
+        worker = self._assignments.pop(key, None)
+        self._rings.pop(key, None)
+        if worker:
+            worker[2] -= 1
+            self._send(worker, ("remove", key))
+
+    def check(self) -> int:
+        """Respawn workers that have exited and give them back their streams; return how many were respawned."""
+        respawned = 0
+        for index, worker in enumerate(self._workers):
+            process = worker[0]
+            if process.is_alive() or time.monotonic() - self._spawned_at[index] < RESPAWN_INTERVAL:
+                continue
+            logger.error(f"Encoder worker {process.name} exited with code {process.exitcode}, respawning")
+            worker[1].close()
+            worker[0], worker[1] = self._spawn(index)
+            self._spawned_at[index] = time.monotonic()
+            for key, assigned in self._assignments.items():
+                if assigned is worker:
+                    ring = self._rings[key]
+                    self._send(worker, ("add", key, ring.name, ring.slots, ring.slot_size))
+            respawned += 1
+        self.respawns += respawned
+        return respawned
+
+    def _send(self, worker: list, message: tuple):
+        try:
+            worker[1].send(message)
+        except (BrokenPipeError, OSError):
+            # The worker has died; check() respawns it and replays its streams.
+            pass
+
+    def close(self):
+        for process, control, _ in self._workers:
+            try:
+                control.send(("stop",))
+            except (BrokenPipeError, OSError):
+                pass
+        for process, control, _ in self._workers:
+            process.join(timeout=2)
+            if process.is_alive():
+                process.terminate()
+            control.close()
+        self._workers = []
+        self._assignments = {}
+        self._rings = {}
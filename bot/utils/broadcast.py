@@ -0,0 +1,551 @@
+import audioop
+import threading
+import time
+
+import discord
+from discord.opus import Encoder as OpusEncoder, OPUS_SILENCE
+
+from bot.utils.audio_workers import EncoderPool
+from bot.utils.logger import get_logger
+from bot.utils.metrics import ENCODE_BUCKETS, Histogram
+from bot.utils.ringbuffer import FrameRing, SharedFrameRing
+
+logger = get_logger("RadioBroadcast")
+
+FFMPEG_BEFORE_OPTIONS = "-reconnect 1 -reconnect_streamed 1 -reconnect_delay_max 5"
+SILENCE_FRAME = b"\x00" * OpusEncoder.FRAME_SIZE
+# Five seconds of 20 ms frames kept for listeners that fall slightly behind.
+BUFFER_FRAMES = 250
+# Large enough for a 20 ms Opus packet at the encoder's maximum bitrate.
+OPUS_SLOT_SIZE = 1500
+# Frames a new listener starts behind the live edge, absorbing upstream jitter.
+TARGET_DEPTH = 10
+# Concealment for an empty buffer: repeat the last frame a few times, then fall back to silence.
+CONCEAL_REPEAT = "repeat"
+CONCEAL_SILENCE = "silence"
+MAX_REPEATS = 3
+# A read arriving this long after the previous one means the frame went out late.
+LATE_READ_GAP = 1.5 * OpusEncoder.FRAME_LENGTH / 1000
+# Loudness is sampled once every this many frames to spot dead air cheaply.
+SILENCE_SAMPLE_INTERVAL = 10
+SILENCE_RMS = 64
+READ_TIMEOUT = OpusEncoder.FRAME_LENGTH / 1000
+RESTART_DELAY = 1.0
+# How long the ingest keeps running with no listeners before it is shut down.
+IDLE_TIMEOUT = 30.0
+DEFAULT_VOLUME = 0.5
+# /volume snaps to multiples of this percentage so guilds share encoded streams.
+VOLUME_STEP = 10
+# Opus bitrates (kbps) guilds are grouped into by their voice channel's bitrate.
+BITRATE_TIERS = (16, 32, 64, 96, 128, 192, 256, 384)
+# discord.py's own encoder default, used when a channel's bitrate is unknown.
+DEFAULT_BITRATE = 128
+
+def snap_volume_level(level: int) -> int:
+    """Round a 0-100 volume level half-up to the nearest shared volume step.
+
+    Only an explicit 0 mutes; any other level snaps to at least one step.
+    """
+    level = min(100, max(0, int(level)))
+    if level == 0:
+        return 0
+    return max(VOLUME_STEP, (level + VOLUME_STEP // 2) // VOLUME_STEP * VOLUME_STEP)
+
+def bitrate_tier(channel_bitrate: int) -> int:
+    """Pick the highest encode tier (kbps) a voice channel's bitrate (bps) can carry."""
+    if not channel_bitrate:
+        return DEFAULT_BITRATE
+    kbps = channel_bitrate // 1000
+    return max((tier for tier in BITRATE_TIERS if tier <= kbps), default=BITRATE_TIERS[0])
+
+def _read_frame_into(ingest, slot: memoryview) -> int:
+    """Read one PCM frame from FFmpeg straight into a ring slot."""
+    stdout = getattr(ingest, "_stdout", None)
+    if stdout is None:
+        frame = ingest.read()
+        slot[:len(frame)] = frame
+        return len(frame)
+    return stdout.readinto(slot[:OpusEncoder.FRAME_SIZE]) or 0
+
+class _FrameStream:
+    """A ring of frames plus the encoder that fills it, shared by listeners at one volume and bitrate."""
+
+    def __init__(self, slots: int, slot_size: int, volume=None, shared: bool = False, bitrate: int = None):
+        self.ring = SharedFrameRing(slots, slot_size) if shared else FrameRing(slots, slot_size)
+        self.volume = volume
+        self.bitrate = bitrate
+        self.encoder = None
+        self.listeners = 0
+
+    @property
+    def key(self):
+        return self.volume, self.bitrate
+
+    def encode(self, pcm: memoryview) -> bytes:
+        if self.encoder is None:
+            self.encoder = OpusEncoder(bitrate=self.bitrate or DEFAULT_BITRATE)
+        if self.volume != 1.0:
+            pcm = audioop.mul(pcm, 2, min(self.volume, 2.0))
+        else:
+            pcm = bytes(pcm)
+        return self.encoder.encode(pcm, OpusEncoder.SAMPLES_PER_FRAME)
+
+class RadioBroadcast:
+    """Decode a radio stream once and share its 20 ms frames with every listener.
+
+    With ``shared_opus`` enabled, listeners are grouped by volume and bitrate tier
+    and each distinct pair is scaled and Opus-encoded once per frame, so encode
+    cost follows the number of pairs in use rather than the number of guilds.
+
+    Frames live in :class:`FrameRing` slots that are allocated when the ingest
+    starts and freed once it idles out. New listeners start ``target_depth``
+    frames behind the live edge so short upstream stalls are absorbed, and an
+    emptied buffer is concealed according to ``conceal``.
+
+    With ``encode_workers`` set, the PCM ring lives in shared memory and the
+    per-volume scaling and encoding run in an :class:`EncoderPool` of worker
+    processes that write straight into shared Opus rings.
+    """
+
+    def __init__(self, stream_url: str, buffer_frames: int = BUFFER_FRAMES, shared_opus: bool = True,
+                 idle_timeout: float = IDLE_TIMEOUT, target_depth: int = TARGET_DEPTH,
+                 conceal: str = CONCEAL_REPEAT, encode_workers: int = 0):
+        if not 0 <= target_depth < buffer_frames - 1:
+            raise ValueError(f"target_depth must be between 0 and {buffer_frames - 2} frames, got {target_depth}")
+        if conceal not in (CONCEAL_REPEAT, CONCEAL_SILENCE):
+            raise ValueError(f"conceal must be {CONCEAL_REPEAT!r} or {CONCEAL_SILENCE!r}, got {conceal!r}")
+        self.stream_url = stream_url
+        self.buffer_frames = buffer_frames
+        self.shared_opus = shared_opus
+        self.idle_timeout = idle_timeout
+        self.target_depth = target_depth
+        self.conceal = conceal
+        self.encode_workers = encode_workers if shared_opus else 0
+        self._pool = None
+        self.underruns = 0
+        self.overruns = 0
+        self.frames_published = 0
+        self.last_frame_at = None
+        self.last_sound_at = None
+        self.encode_time = Histogram(ENCODE_BUCKETS)
+        self._restart_requested = False
+        self._idle_since = None
+        self._generation = 0
+        # Allocated when the ingest first needs it and freed when it idles out.
+        self._pcm = None
+        self._encoded = {}
+        self._cond = threading.Condition()
+        self._listeners = set()
+        self._ingest = None
+        self._thread = None
+        self._running = False
+
+    @property
+    def listener_count(self) -> int:
+        return len(self._listeners)
+
+    @property
+    def encoded_streams(self) -> list:
+        """``(volume, bitrate)`` pairs that currently have a shared Opus stream."""
+        return sorted(self._encoded)
+
+    @property
+    def worker_pids(self) -> list:
+        return self._pool.pids if self._pool else []
+
+    @property
+    def is_running(self) -> bool:
+        return self._running
+
+    @property
+    def ingest_pid(self):
+        """PID of the FFmpeg process currently feeding the broadcast, if any."""
+        process = getattr(self._ingest, "_process", None)
+        return getattr(process, "pid", None)
+
+    def create_source(self, volume: float = DEFAULT_VOLUME, bitrate: int = DEFAULT_BITRATE) -> "BroadcastSource":
+        """Create a listener cursor attached to the live edge of the broadcast."""
+        source = BroadcastSource(self, volume if self.shared_opus else None, bitrate)
+        self.attach(source)
+        return source
+
+    def warm(self):
+        """Start the ingest ahead of the first listener so frames are buffered by the time one attaches.
+
+        A warmed broadcast that nobody attaches to shuts down after ``idle_timeout``.
+        """
+        with self._cond:
+            if not self._ingest_alive:
+                self._idle_since = time.monotonic()
+                self._start()
+
+    def attach(self, source: "BroadcastSource"):
+        with self._cond:
+            stream = self._subscribe(source.volume, source.bitrate)
+            self._listeners.add(source)
+            source._stream = stream
+            source._position = self._start_position(stream)
+            source._rebuffering = False
+            source._attached = True
+            source._last_read_at = None
+            self._idle_since = None
+            if not self._ingest_alive:
+                self._start()
+
+    def detach(self, source: "BroadcastSource"):
+        with self._cond:
+            source._last = None
+            if source in self._listeners:
+                self._listeners.discard(source)
+                self._unsubscribe(source._stream)
+                if not self._listeners:
+                    self._idle_since = time.monotonic()
+            source._attached = False
+            self._cond.notify_all()
+
+    def retune(self, source: "BroadcastSource", volume: float, bitrate: int = None):
+        """Move an attached listener onto the shared stream for another volume or bitrate."""
+        bitrate = bitrate or source.bitrate
+        with self._cond:
+            if source._attached:
+                # Drop the view into the old ring before that ring can be released.
+                source._last = None
+                self._unsubscribe(source._stream)
+                source._stream = self._subscribe(volume, bitrate)
+                source._position = self._start_position(source._stream)
+                source._rebuffering = False
+                # Wake a read waiting on the old ring so it gives that ring up.
+                self._cond.notify_all()
+            source._volume = volume
+            source._bitrate = bitrate
+
+    def frame_at(self, source: "BroadcastSource", timeout: float = READ_TIMEOUT):
+        """Return the next frame for ``source`` and advance its cursor.
+
+        The cursor is read and moved under the lock, so a concurrent
+        :meth:`retune` is never overwritten. The frame is ``None`` if it has
+        not arrived within ``timeout`` (an underrun) or the source was
+        detached or moved to another stream while waiting. After an underrun the cursor keeps
+        returning ``None`` until ``target_depth`` frames have built up again,
+        so the next stall is absorbed too. Opus packets are copied out of the
+        ring; PCM frames are views into it.
+        """
+        with self._cond:
+            # A detached source's ring may already be closed, so nothing below may touch it.
+            if not source._attached:
+                return None
+            stream = source._stream
+            ring = stream.ring
+            position = source._position
+            if source._rebuffering:
+                if ring.head - position < self.target_depth:
+                    return None
+                source._rebuffering = False
+            if position >= ring.head:
+                self._cond.wait_for(
+                    lambda: (source._stream is not stream or not source._attached or not self._running
+                             or position < ring.head),
+                    timeout
+                )
+            if source._stream is not stream or not source._attached:
+                return None
+            if position >= ring.head:
+                self.underruns += 1
+                source._rebuffering = self.target_depth > 0
+                return None
+            if position < ring.oldest:
+                # The listener fell behind the buffer (an overrun); rejoin at the target depth.
+                self.overruns += 1
+                position = self._start_position(stream)
+            source._position = position + 1
+            frame = ring.read(position)
+            return frame if stream.volume is None else bytes(frame)
+
+    def restart(self, stream_url: str = None):
+        """Replace the running ingest, optionally switching to another stream URL.
+
+        Listeners stay attached and are fed concealment frames until the new
+        ingest produces audio.
+        """
+        if stream_url:
+            self.stream_url = stream_url
+        with self._cond:
+            if self._running and not self._ingest_alive:
+                logger.warning(f"Ingest thread for {self.stream_url} is gone, starting a new one")
+                self._start()
+                return
+            self._restart_requested = True
+        self._signal_ingest()
+
+    def check_workers(self) -> int:
+        """Respawn encoder worker processes that have died; return how many were respawned."""
+        with self._cond:
+            return self._pool.check() if self._pool else 0
+
+    def close(self):
+        """Stop the ingest and release every listener."""
+        with self._cond:
+            self._running = False
+            for source in self._listeners:
+                source._attached = False
+            self._listeners.clear()
+            encoded, self._encoded = list(self._encoded.values()), {}
+            self._cond.notify_all()
+        self._signal_ingest()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=5)
+        self._thread = None
+        with self._cond:
+            pool, self._pool = self._pool, None
+            pcm, self._pcm = self._pcm, None
+        if pool:
+            pool.close()
+        for stream in encoded:
+            if isinstance(stream.ring, SharedFrameRing):
+                stream.ring.close()
+        if pcm and isinstance(pcm.ring, SharedFrameRing):
+            pcm.ring.close()
+
+    def _start_position(self, stream: _FrameStream) -> int:
+        return max(stream.ring.oldest, stream.ring.head - self.target_depth)
+
+    def _pcm_stream(self) -> _FrameStream:
+        if self._pcm is None:
+            self._pcm = _FrameStream(self.buffer_frames, OpusEncoder.FRAME_SIZE, shared=self.encode_workers > 0)
+        return self._pcm
+
+    def _subscribe(self, volume, bitrate: int = DEFAULT_BITRATE) -> _FrameStream:
+        if volume is None:
+            stream = self._pcm_stream()
+        else:
+            stream = self._encoded.get((volume, bitrate))
+            if stream is None:
+                stream = self._encoded[(volume, bitrate)] = _FrameStream(
+                    self.buffer_frames, OPUS_SLOT_SIZE, volume, shared=self.encode_workers > 0, bitrate=bitrate
+                )
+                if self.encode_workers:
+                    if self._pool is None:
+                        self._pool = EncoderPool(self.encode_workers, self._pcm_stream().ring)
+                    self._pool.add(stream.key, stream.ring)
+                logger.info(f"Opened shared Opus stream at volume {volume:.2f}, {bitrate} kbps")
+        stream.listeners += 1
+        return stream
+
+    def _unsubscribe(self, stream: _FrameStream):
+        stream.listeners -= 1
+        if stream.volume is not None and stream.listeners <= 0:
+            self._encoded.pop(stream.key, None)
+            if self._pool:
+                self._pool.remove(stream.key)
+                stream.ring.close()
+            logger.info(f"Closed shared Opus stream at volume {stream.volume:.2f}, {stream.bitrate} kbps")
+
+    def _start(self):
+        self._running = True
+        # Give a fresh ingest the same grace period a stalled one gets.
+        self.last_frame_at = self.last_sound_at = time.monotonic()
+        self._generation += 1
+        self._thread = threading.Thread(target=self._run, args=(self._generation, self._pcm_stream().ring),
+                                        name="radio-broadcast-ingest", daemon=True)
+        self._thread.start()
+        logger.info(f"Started shared ingest for {self.stream_url}")
+
+    @property
+    def _ingest_alive(self) -> bool:
+        return self._running and self._thread is not None and self._thread.is_alive()
+
+    def _signal_ingest(self):
+        """Kill the FFmpeg process so the ingest thread's read returns.
+
+        Only the ingest thread cleans its process up; doing it from here would
+        close the pipe under a read that is still in progress.
+        """
+        process = getattr(self._ingest, "_process", None)
+        if process:
+            try:
+                process.kill()
+            except OSError:
+                pass
+
+    def _release_buffers(self, generation: int):
+        """Free the PCM ring and encoder pool of an ingest that stopped with nobody left to serve."""
+        with self._cond:
+            if self._generation != generation or self._running or self._listeners or self._encoded:
+                return
+            pool, self._pool = self._pool, None
+            pcm, self._pcm = self._pcm, None
+        if pool:
+            pool.close()
+        if pcm and isinstance(pcm.ring, SharedFrameRing):
+            pcm.ring.close()
+        logger.info(f"Released buffers for {self.stream_url}")
+
+    def _check_idle(self) -> bool:
+        """Stop the broadcast once it has had no listeners for ``idle_timeout`` seconds."""
+        with self._cond:
+            if self._listeners or self._idle_since is None:
+                return False
+            if time.monotonic() - self._idle_since < self.idle_timeout:
+                return False
+            self._running = False
+            self._cond.notify_all()
+            return True
+
+    def _shut_down_if_idle(self) -> bool:
+        # Also checked between restarts, so a dead upstream with nobody listening is not retried forever.
+        if self._check_idle():
+            logger.info(f"No listeners left for {self.stream_url}, shutting down ingest")
+            return True
+        return False
+
+    def _publish(self, ring, frame: memoryview):
+        # ``frame`` is the PCM ring's write slot, which no reader can see until it is
+        # committed, so encoding can safely happen outside the lock.
+        with self._cond:
+            # Worker processes encode for themselves; only encode here in the single-process mode.
+            streams = [] if self._pool else list(self._encoded.values())
+        encoded = []
+        for stream in streams:
+            try:
+                started = time.perf_counter()
+                encoded.append((stream, stream.encode(frame)))
+                self.encode_time.observe(time.perf_counter() - started)
+            except Exception as e:
+                logger.error(f"Failed to encode frame at volume {stream.volume:.2f}, {stream.bitrate} kbps: {e}")
+        now = time.monotonic()
+        if self.frames_published % SILENCE_SAMPLE_INTERVAL == 0 and audioop.rms(frame, 2) >= SILENCE_RMS:
+            self.last_sound_at = now
+        with self._cond:
+            self.frames_published += 1
+            self.last_frame_at = now
+            ring.commit(len(frame))
+            for stream, packet in encoded:
+                stream.ring.write(packet)
+            self._cond.notify_all()
+
+    def _active(self, generation: int) -> bool:
+        return self._running and self._generation == generation
+
+    def _run(self, generation: int, ring):
+        while self._active(generation):
+            try:
+                ingest = self._ingest = discord.FFmpegPCMAudio(self.stream_url, before_options=FFMPEG_BEFORE_OPTIONS)
+            except Exception as e:
+                logger.error(f"Failed to start ingest: {e}")
+                if self._shut_down_if_idle():
+                    break
+                time.sleep(RESTART_DELAY)
+                continue
+            try:
+                while self._active(generation):
+                    slot = ring.write_slot()
+                    length = _read_frame_into(ingest, slot)
+                    if length != OpusEncoder.FRAME_SIZE:
+                        break
+                    self._publish(ring, slot[:length])
+                    if self._shut_down_if_idle():
+                        break
+            except Exception as e:
+                logger.error(f"Ingest for {self.stream_url} failed: {e}")
+            # A restarted broadcast may already own a newer ingest; only release our own.
+            try:
+                ingest.cleanup()
+            except Exception as e:
+                logger.error(f"Failed to clean up ingest for {self.stream_url}: {e}")
+            if self._ingest is ingest:
+                self._ingest = None
+            if self._restart_requested:
+                self._restart_requested = False
+                logger.info(f"Restarting ingest on {self.stream_url}")
+            elif self._active(generation):
+                if self._shut_down_if_idle():
+                    break
+                logger.warning(f"Ingest for {self.stream_url} ended, restarting in {RESTART_DELAY}s")
+                time.sleep(RESTART_DELAY)
+        logger.info(f"Stopped shared ingest for {self.stream_url}")
+        self._release_buffers(generation)
+
+class BroadcastSource(discord.AudioSource):
+    """A lightweight per-guild cursor over a shared :class:`RadioBroadcast`.
+
+    When created with a volume the cursor reads pre-encoded Opus packets for that
+    volume and bitrate; otherwise it yields raw PCM and should be wrapped in a
+    volume transformer.
+    PCM frames are returned as zero-copy views into the broadcast's ring.
+    """
+
+    def __init__(self, broadcast: RadioBroadcast, volume=None, bitrate: int = DEFAULT_BITRATE):
+        self.broadcast = broadcast
+        self._volume = volume
+        self._bitrate = bitrate
+        self._stream = None
+        self._position = 0
+        self._rebuffering = False
+        self._attached = False
+        self._last = None
+        self._repeats = 0
+        self._last_read_at = None
+        # perf_counter() time playback was requested; the first real frame reports its delay.
+        self.started_at = time.perf_counter()
+        self.first_frame_delay = None
+        self.on_first_frame = None
+        self.frames_read = 0
+        self.frames_late = 0
+        self.frames_concealed = 0
+
+    @property
+    def volume(self):
+        return self._volume
+
+    @volume.setter
+    def volume(self, value: float):
+        if self._volume is None:
+            raise AttributeError("PCM listeners are scaled by their volume transformer")
+        self.broadcast.retune(self, round(value, 2))
+
+    @property
+    def bitrate(self) -> int:
+        return self._bitrate
+
+    @bitrate.setter
+    def bitrate(self, kbps: int):
+        if self._volume is None:
+            # PCM listeners are encoded by their voice client; only remember the tier.
+            self._bitrate = kbps
+        elif kbps != self._bitrate:
+            self.broadcast.retune(self, self._volume, kbps)
+
+    def read(self):
+        if not self._attached:
+            return b""
+        now = time.perf_counter()
+        if self._last_read_at is not None and now - self._last_read_at > LATE_READ_GAP:
+            self.frames_late += 1
+        self._last_read_at = now
+        frame = self.broadcast.frame_at(self)
+        if frame is None:
+            if not self.broadcast.is_running:
+                return b""
+            return self._conceal()
+        self._last = frame
+        self._repeats = 0
+        self.frames_read += 1
+        if self.first_frame_delay is None:
+            self.first_frame_delay = now - self.started_at
+            if self.on_first_frame:
+                self.on_first_frame(self.first_frame_delay)
+        return frame
+
+    def _conceal(self):
+        self.frames_concealed += 1
+        if (self.broadcast.conceal == CONCEAL_REPEAT and self._last is not None
+                and self._repeats < MAX_REPEATS):
+            self._repeats += 1
+            return self._last
+        return OPUS_SILENCE if self.is_opus() else SILENCE_FRAME
+
+    def is_opus(self) -> bool:
+        return self._volume is not None
+
+    def cleanup(self):
+        self.broadcast.detach(self)
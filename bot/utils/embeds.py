@@ -0,0 +1,90 @@
+import collections
+
+import discord
+
+from bot.utils.metadata import track_key
+
+EMBED_COLOR = 0x9370DB
+# Keeps the current track plus a few recent ones for announcements still in flight.
+DEFAULT_MAXSIZE = 16
+DEFAULT_STATION_NAME = "Radio Monash"
+DEFAULT_WEBSITE = "radiomonash.online"
+
+def build_track_embed(track_data, station_name: str = DEFAULT_STATION_NAME,
+                      website: str = DEFAULT_WEBSITE) -> discord.Embed:
+    """Create a rich embed for track information."""
+    embed = discord.Embed(
+        title=track_data.get('title', 'Unknown Title'),
+        color=EMBED_COLOR
+    )
+    embed.set_author(name=station_name)
+    embed.add_field(name="Artist", value=track_data.get('artist', 'Unknown Artist'), inline=True)
+    if track_data.get('album'):
+        embed.add_field(name="Album", value=track_data.get('album'), inline=True)
+    duration = track_data.get('duration', 0)
+    if duration:
+        minutes = int(duration) // 60
+        seconds = int(duration) % 60
+        embed.add_field(name="Duration", value=f"{minutes}:{seconds:02d}", inline=True)
+    if track_data.get('cover'):
+        embed.set_thumbnail(url=track_data.get('cover'))
+    if track_data.get('buy_link'):
+        embed.add_field(name="Stream/Buy", value=f"[Listen Online]({track_data.get('buy_link')})", inline=False)
+    embed.set_footer(text=f"Tune in {website}" if website else f"Tune in to {station_name}")
+    return embed
+
+def build_play_embed(track_data, station_name: str = DEFAULT_STATION_NAME) -> discord.Embed:
+    """Create the embed sent when the bot starts playing in a guild."""
+    embed = discord.Embed(
+        title=f"📻 {station_name} Now Playing",
+        color=EMBED_COLOR
+    )
+    if track_data:
+        embed.add_field(
+            name="Current Track",
+            value=f"**{track_data.get('artist', 'Unknown Artist')}** - **{track_data.get('title', 'Unknown Title')}**",
+            inline=False
+        )
+        if track_data.get('cover'):
+            embed.set_thumbnail(url=track_data.get('cover'))
+    embed.set_footer(text="Use /stop to disconnect | /track for detailed track info")
+    return embed
+
+class RenderedTrack:
+    """Prebuilt, read-only embeds for one track."""
+
+    __slots__ = ("key", "track_embed", "play_embed", "payload")
+
+    def __init__(self, track_data, station_name: str = DEFAULT_STATION_NAME, website: str = DEFAULT_WEBSITE):
+        self.key = track_key(track_data)
+        self.track_embed = build_track_embed(track_data, station_name, website) if track_data else None
+        self.play_embed = build_play_embed(track_data, station_name)
+        self.payload = self.track_embed.to_dict() if self.track_embed else None
+
+class TrackEmbedCache:
+    """LRU cache of :class:`RenderedTrack` entries keyed by track identity."""
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE, station_name: str = DEFAULT_STATION_NAME,
+                 website: str = DEFAULT_WEBSITE):
+        self.maxsize = maxsize
+        self.station_name = station_name
+        self.website = website
+        self._entries = collections.OrderedDict()
+        self._empty = RenderedTrack(None, station_name, website)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, track_data) -> RenderedTrack:
+        """Return the rendered embeds for ``track_data``, building them on first use."""
+        if not track_data:
+            return self._empty
+        key = track_key(track_data)
+        rendered = self._entries.get(key)
+        if rendered is None:
+            rendered = self._entries[key] = RenderedTrack(track_data, self.station_name, self.website)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        else:
+            self._entries.move_to_end(key)
+        return rendered
@@ -4,6 +4,7 @@ import subprocess
 import tempfile
 import shutil
 import zipfile
+import json
 import logging
 import urllib.request
 
@@ -11,14 +12,116 @@ from bot.utils.logger import get_logger
 
 logger = get_logger("FFmpegInstaller")
 
+# Cached result of the FFmpeg capability probe, keyed by the binary it came from.
+PROBE_CACHE_PATH = "ffmpeg_probe.json"
+PROBE_TIMEOUT = 10
+# RadioKing streams are only served over HTTPS.
+REQUIRED_PROTOCOLS = ("https",)
+# Stream codecs the bot is expected to decode; missing ones are only warned about.
+EXPECTED_CODECS = ("mp3", "aac", "opus")
+
 def is_ffmpeg_installed() -> bool:
-    """Check if FFmpeg is available in PATH."""
+    """Check if FFmpeg is available in PATH and actually runs."""
     try:
-        subprocess.run(["ffmpeg", "-version"], stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=False)
-        return True
+        result = subprocess.run(["ffmpeg", "-version"], stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                check=False, timeout=PROBE_TIMEOUT)
+        return result.returncode == 0
     except (subprocess.SubprocessError, FileNotFoundError):
         return False
 
+class FFmpegCapabilities:
+    """What the installed FFmpeg binary reports it can do."""
+
+    __slots__ = ("path", "version", "protocols", "codecs")
+
+    def __init__(self, path: str, version: str, protocols, codecs):
+        self.path = path
+        self.version = version
+        self.protocols = set(protocols)
+        self.codecs = set(codecs)
+
+    @property
+    def missing_protocols(self) -> list:
+        return [name for name in REQUIRED_PROTOCOLS if name not in self.protocols]
+
+    @property
+    def missing_codecs(self) -> list:
+        return [name for name in EXPECTED_CODECS if name not in self.codecs]
+
+    def to_dict(self) -> dict:
+        return {"path": self.path, "version": self.version,
+                "protocols": sorted(self.protocols), "codecs": sorted(self.codecs)}
+
+def _run_ffmpeg(path: str, *args) -> str:
+    result = subprocess.run([path, "-hide_banner", *args], stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                            check=False, timeout=PROBE_TIMEOUT, text=True)
+    if result.returncode != 0:
+        raise subprocess.SubprocessError(f"ffmpeg {' '.join(args)} exited with code {result.returncode}")
+    return result.stdout
+
+def _parse_protocols(output: str) -> list:
+    """Input protocols from ``ffmpeg -protocols``."""
+    protocols, reading = [], False
+    for line in output.splitlines():
+        line = line.strip()
+        if line == "Input:":
+            reading = True
+        elif line == "Output:":
+            break
+        elif reading and line:
+            protocols.append(line)
+    return protocols
+
+def _parse_codecs(output: str) -> list:
+    """Decodable codecs from ``ffmpeg -codecs``."""
+    codecs, reading = [], False
+    for line in output.splitlines():
+        fields = line.split()
+        if fields and fields[0].startswith("---"):
+            reading = True
+        elif reading and len(fields) >= 2 and fields[0].startswith("D"):
+            codecs.append(fields[1])
+    return codecs
+
+def _binary_fingerprint(path: str) -> str:
+    stat = os.stat(path)
+    return f"{os.path.realpath(path)}:{stat.st_size}:{stat.st_mtime_ns}"
+
+def probe_ffmpeg(cache_path: str = None):
+    """Return the installed FFmpeg's capabilities, or ``None`` if it is missing or broken.
+
+    The result is cached on disk against the binary's path, size and mtime, so
+    redeploys with an unchanged FFmpeg skip the subprocess calls entirely.
+    The cache lives at ``RADBOT_FFMPEG_CACHE`` unless ``cache_path`` is given.
+    """
+    # Resolved per call so a value loaded from .env after import is honoured.
+    cache_path = cache_path or os.getenv("RADBOT_FFMPEG_CACHE", PROBE_CACHE_PATH)
+    path = shutil.which("ffmpeg")
+    if path is None:
+        return None
+    fingerprint = _binary_fingerprint(path)
+    try:
+        with open(cache_path) as f:
+            cached = json.load(f)
+        if cached.get("fingerprint") == fingerprint:
+            return FFmpegCapabilities(cached["path"], cached["version"], cached["protocols"], cached["codecs"])
+    except (OSError, ValueError, KeyError):
+        pass
+    try:
+        version = _run_ffmpeg(path, "-version").split()[2]
+        capabilities = FFmpegCapabilities(
+            path, version, _parse_protocols(_run_ffmpeg(path, "-protocols")), _parse_codecs(_run_ffmpeg(path, "-codecs"))
+        )
+    except (subprocess.SubprocessError, OSError, IndexError) as e:
+        logger.error(f"FFmpeg at {path} failed its capability probe: {e}")
+        return None
+    try:
+        with open(cache_path, "w") as f:
+            json.dump({"fingerprint": fingerprint, **capabilities.to_dict()}, f)
+    except OSError as e:
+        logger.warning(f"Could not cache the FFmpeg probe at {cache_path}: {e}")
+    return capabilities
+
 def install_ffmpeg_windows() -> bool:
     """Download and install FFmpeg for Windows."""
     try:
@@ -120,22 +223,36 @@ def install_ffmpeg_macos() -> bool:
         logger.error(f"Unexpected error installing FFmpeg: {e}")
         return False
 
+def check_ffmpeg_capabilities() -> bool:
+    """Probe FFmpeg and report whether it can play the RadioKing streams."""
+    capabilities = probe_ffmpeg()
+    if capabilities is None:
+        return False
+    if capabilities.missing_codecs:
+        logger.warning(f"FFmpeg {capabilities.version} cannot decode: {', '.join(capabilities.missing_codecs)}")
+    if capabilities.missing_protocols:
+        logger.error(f"FFmpeg {capabilities.version} lacks required protocol(s): "
+                     f"{', '.join(capabilities.missing_protocols)}")
+        return False
+    logger.info(f"FFmpeg {capabilities.version} is installed and supports the required protocols.")
+    return True
+
 def check_and_install_ffmpeg() -> bool:
-    """Check if FFmpeg is installed; if not, attempt to install it."""
+    """Check if a capable FFmpeg is installed; if none is found, attempt to install it."""
     logger.info("Checking FFmpeg installation...")
-    if is_ffmpeg_installed():
-        logger.info("FFmpeg is already installed and accessible.")
-        return True
+    if shutil.which("ffmpeg"):
+        return check_ffmpeg_capabilities()
     
     logger.warning("FFmpeg not found. Attempting to install...")
     system = platform.system().lower()
     
     if system == "windows":
-        return install_ffmpeg_windows()
+        installed = install_ffmpeg_windows()
     elif system == "linux":
-        return install_ffmpeg_linux()
+        installed = install_ffmpeg_linux()
     elif system == "darwin":
-        return install_ffmpeg_macos()
+        installed = install_ffmpeg_macos()
     else:
         logger.error(f"Unsupported operating system: {system}")
         return False
+    return installed and check_ffmpeg_capabilities()
@@ -0,0 +1,158 @@
+import asyncio
+import collections
+import json
+import multiprocessing
+import os
+import sys
+import threading
+import time
+
+import discord
+
+from bot.utils.embeds import EMBED_COLOR
+from bot.utils.logger import get_logger
+from bot.utils.metadata import track_key
+
+logger = get_logger("TrackHistory")
+
+# Overridden by RADBOT_HISTORY_SIZE, read when a history is created so values from .env apply.
+DEFAULT_SIZE = 200
+PAGE_SIZE = 10
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else None
+
+def history_path(path: str, station: str) -> str:
+    """Return the history file for ``station``, kept apart per process like the log files."""
+    root, ext = os.path.splitext(path)
+    if multiprocessing.parent_process() is not None:
+        return f"{root}.{station}.{multiprocessing.current_process().name}{ext}"
+    return f"{root}.{station}{ext}"
+
+class HistoryEntry:
+    """One played track, with its strings interned so repeats share storage."""
+
+    __slots__ = ("played_at", "title", "artist", "album", "started_at")
+
+    def __init__(self, played_at: float, title: str, artist: str, album: str = None, started_at: str = None):
+        self.played_at = played_at
+        self.title = _intern(title)
+        self.artist = _intern(artist)
+        self.album = _intern(album)
+        self.started_at = started_at
+
+    @classmethod
+    def from_track(cls, track_data, played_at: float = None):
+        return cls(played_at or time.time(), track_data.get('title'), track_data.get('artist'),
+                   track_data.get('album'), track_data.get('started_at'))
+
+    @property
+    def key(self):
+        return (self.title, self.artist, self.started_at)
+
+    def to_list(self) -> list:
+        return [self.played_at, self.title, self.artist, self.album, self.started_at]
+
+class TrackHistory:
+    """Bounded record of the tracks a station has played, newest first.
+
+    Entries live in a fixed-length deque, so memory stays flat however long the
+    bot runs. Page embeds are built once and served from memory until the next
+    track change. With ``path`` set, entries are appended to a JSON-lines file
+    on a worker thread and reloaded on startup; the file is rewritten once it
+    holds twice as many lines as the history keeps.
+    """
+
+    def __init__(self, maxsize: int = None, path: str = None, station_name: str = None):
+        maxsize = maxsize or int(os.getenv("RADBOT_HISTORY_SIZE", DEFAULT_SIZE))
+        self.maxsize = maxsize
+        self.path = path
+        self.station_name = station_name
+        self._entries = collections.deque(maxlen=maxsize)
+        self._pages = {}
+        self._lines = 0
+        self._file_lock = threading.Lock()
+        if path:
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self):
+        return reversed(self._entries)
+
+    @property
+    def page_count(self) -> int:
+        return max(1, -(-len(self._entries) // PAGE_SIZE))
+
+    async def record(self, track_data):
+        """Append a track change, ignoring repeats of the latest entry."""
+        if not track_data:
+            return
+        entry = HistoryEntry.from_track(track_data)
+        if self._entries and self._entries[-1].key == track_key(track_data):
+            return
+        self._entries.append(entry)
+        self._pages.clear()
+        if self.path:
+            try:
+                await asyncio.to_thread(self._write, entry, list(self._entries))
+            except OSError as e:
+                logger.warning(f"Could not persist track history to {self.path}: {e}")
+
+    def page(self, number: int) -> discord.Embed:
+        """Return the prebuilt embed for 1-based page ``number``, clamped to the pages that exist."""
+        number = min(max(1, number), self.page_count)
+        embed = self._pages.get(number)
+        if embed is None:
+            embed = self._pages[number] = self._build_page(number)
+        return embed
+
+    def _build_page(self, number: int) -> discord.Embed:
+        entries = list(self)[(number - 1) * PAGE_SIZE:number * PAGE_SIZE]
+        embed = discord.Embed(
+            title=f"🕘 Recently played on {self.station_name}" if self.station_name else "🕘 Recently played",
+            color=EMBED_COLOR
+        )
+        if entries:
+            embed.description = "\n".join(
+                f"<t:{int(entry.played_at)}:t> **{entry.artist or 'Unknown Artist'}** - "
+                f"{entry.title or 'Unknown Title'}"
+                for entry in entries
+            )
+        else:
+            embed.description = "No tracks have been played yet."
+        embed.set_footer(text=f"Page {number}/{self.page_count} | /history <page> for older tracks")
+        return embed
+
+    def _load(self):
+        try:
+            lines = collections.deque(maxlen=self.maxsize)
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    lines.append(line)
+                    self._lines += 1
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            logger.warning(f"Could not read track history from {self.path}: {e}")
+            return
+        for line in lines:
+            try:
+                self._entries.append(HistoryEntry(*json.loads(line)))
+            except (ValueError, TypeError):
+                continue
+        logger.info(f"Loaded {len(self._entries)} track(s) of history from {self.path}")
+
+    def _write(self, entry: HistoryEntry, entries: list):
+        with self._file_lock:
+            if self._lines >= 2 * self.maxsize:
+                temp_path = f"{self.path}.tmp"
+                with open(temp_path, "w", encoding="utf-8") as f:
+                    f.writelines(json.dumps(item.to_list()) + "\n" for item in entries)
+                os.replace(temp_path, self.path)
+                self._lines = len(entries)
+                return
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry.to_list()) + "\n")
+            self._lines += 1
@@ -1,6 +1,24 @@
+import atexit
+import json
 import logging
+import logging.handlers
+import multiprocessing
+import os
+import queue
+import threading
+import time
 import colorlog
 
+LOG_FILE = "radio_monash_bot.log"
+MAX_BYTES = 10 * 1024 * 1024
+BACKUP_COUNT = 5
+# Records waiting for the writer thread; beyond this new records are dropped rather than blocking.
+QUEUE_SIZE = 10000
+# Identical warnings and errors within this many seconds are collapsed into one.
+STORM_WINDOW = 60.0
+# Warnings and errors each logger may emit per second before the rest are dropped.
+STORM_RATE = 20
+
 log_colors = {
     'DEBUG': 'cyan',
     'INFO': 'green',
@@ -14,18 +32,149 @@ formatter = colorlog.ColoredFormatter(
     log_colors=log_colors
 )
 
-def get_logger(name: str, log_file: str = "radio_monash_bot.log") -> logging.Logger:
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, for log shippers."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        return json.dumps({
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "process": record.processName,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        })
+
+class StormFilter(logging.Filter):
+    """Collapse repeated warnings and errors and cap how fast each logger can emit them.
+
+    An identical message seen again within ``window`` seconds is suppressed and
+    counted; the next copy after the window says how many were hidden. INFO and
+    below always pass.
+    """
+
+    def __init__(self, window: float = STORM_WINDOW, rate: float = STORM_RATE):
+        super().__init__()
+        self.window = window
+        self.rate = rate
+        self.suppressed = 0
+        self.dropped = 0
+        self._seen = {}
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno < logging.WARNING:
+            return True
+        message = record.getMessage()
+        now = time.monotonic()
+        with self._lock:
+            key = (record.name, record.levelno, message)
+            seen = self._seen.get(key)
+            if seen and now - seen[0] < self.window:
+                seen[1] += 1
+                self.suppressed += 1
+                return False
+            tokens, updated = self._buckets.get(record.name, (self.rate, now))
+            tokens = min(self.rate, tokens + (now - updated) * self.rate)
+            if tokens < 1:
+                self._buckets[record.name] = (tokens, now)
+                self.dropped += 1
+                return False
+            self._buckets[record.name] = (tokens - 1, now)
+            if len(self._seen) > 1000:
+                self._seen = {k: v for k, v in self._seen.items() if now - v[0] < self.window}
+            self._seen[key] = [now, 0]
+        if seen and seen[1]:
+            record.msg = f"{message} (repeated {seen[1]} more time(s) in the last {self.window:.0f}s)"
+            record.args = None
+        return True
+
+class _DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that drops records when the writer falls behind instead of blocking."""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+storm_filter = StormFilter()
+_queue = queue.Queue(QUEUE_SIZE)
+queue_handler = _DroppingQueueHandler(_queue)
+queue_handler.addFilter(storm_filter)
+_listener = None
+_listener_lock = threading.Lock()
+
+def _file_handler(log_file: str, rotation: str, max_bytes: int, backups: int) -> logging.Handler:
+    if rotation == "size":
+        return logging.handlers.RotatingFileHandler(
+            log_file, maxBytes=max_bytes, backupCount=backups, encoding="utf-8", delay=True
+        )
+    return logging.handlers.TimedRotatingFileHandler(
+        log_file, when=rotation, backupCount=backups, encoding="utf-8", delay=True
+    )
+
+def configure_logging(log_file: str = None, json_mode: bool = None, rotation: str = None,
+                      max_bytes: int = None, backups: int = None):
+    """(Re)start the background log writer.
+
+    Anything not passed is read from ``RADBOT_LOG_FILE``, ``RADBOT_LOG_JSON``,
+    ``RADBOT_LOG_ROTATION`` (``size`` or a ``TimedRotatingFileHandler`` interval
+    such as ``midnight``), ``RADBOT_LOG_MAX_BYTES`` and ``RADBOT_LOG_BACKUPS``.
+    Child processes write to their own file so rotation never races.
+    """
+    global _listener
+    log_file = log_file or os.getenv("RADBOT_LOG_FILE", LOG_FILE)
+    if json_mode is None:
+        json_mode = os.getenv("RADBOT_LOG_JSON", "").lower() in ("1", "true", "yes")
+    rotation = rotation or os.getenv("RADBOT_LOG_ROTATION", "size")
+    max_bytes = max_bytes or int(os.getenv("RADBOT_LOG_MAX_BYTES", MAX_BYTES))
+    backups = backups if backups is not None else int(os.getenv("RADBOT_LOG_BACKUPS", BACKUP_COUNT))
+    if multiprocessing.parent_process() is not None:
+        root, ext = os.path.splitext(log_file)
+        log_file = f"{root}.{multiprocessing.current_process().name}{ext}"
+
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(JsonFormatter() if json_mode else formatter)
+    file_handler = _file_handler(log_file, rotation, max_bytes, backups)
+    file_handler.setFormatter(JsonFormatter() if json_mode else logging.Formatter(
+        "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    ))
+    with _listener_lock:
+        if _listener:
+            _listener.stop()
+            for handler in _listener.handlers:
+                handler.close()
+        _listener = logging.handlers.QueueListener(_queue, console_handler, file_handler)
+        _listener.start()
+
+def _shutdown():
+    global _listener
+    with _listener_lock:
+        if _listener:
+            # Drains whatever is still queued before the process exits.
+            _listener.stop()
+            for handler in _listener.handlers:
+                handler.close()
+            _listener = None
+
+atexit.register(_shutdown)
+
+def get_logger(name: str, log_file: str = None) -> logging.Logger:
+    """Return a logger whose records are written by a single background thread.
+
+    Callers only enqueue records, so logging from the event loop or an audio
+    thread never waits on disk or console I/O.
+    """
+    if _listener is None:
+        configure_logging(log_file)
     logger = logging.getLogger(name)
     if not logger.handlers:
         logger.setLevel(logging.INFO)
-        # Console handler
-        console_handler = logging.StreamHandler()
-        console_handler.setFormatter(formatter)
-        # File handler
-        file_handler = logging.FileHandler(log_file)
-        file_handler.setFormatter(logging.Formatter(
-            "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-        ))
-        logger.addHandler(console_handler)
-        logger.addHandler(file_handler)
+        logger.addHandler(queue_handler)
     return logger
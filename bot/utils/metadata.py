@@ -0,0 +1,110 @@
+import asyncio
+import time
+
+import aiohttp
+
+from bot.utils.logger import get_logger
+from bot.utils.metrics import LATENCY_BUCKETS, Histogram
+
+logger = get_logger("TrackMetadata")
+
+# How long a fetched payload is served without revalidation.
+DEFAULT_TTL = 15.0
+REQUEST_TIMEOUT = 10
+
+def track_key(track_data):
+    """Identify a track payload by the fields that change between tracks."""
+    if not track_data:
+        return None
+    return (track_data.get('title'), track_data.get('artist'), track_data.get('started_at'))
+
+def create_http_session() -> aiohttp.ClientSession:
+    """Create the long-lived keep-alive session shared by all RadioKing API calls."""
+    connector = aiohttp.TCPConnector(limit=10, keepalive_timeout=75, ttl_dns_cache=300)
+    return aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT))
+
+class TrackMetadataCache:
+    """Cache the current-track payload of the RadioKing API.
+
+    Concurrent refreshes share one in-flight request, revalidation uses
+    ``ETag``/``Last-Modified`` conditional GETs, and stale data keeps being
+    served while a background refresh is running.
+    """
+
+    def __init__(self, session: aiohttp.ClientSession, url: str, ttl: float = DEFAULT_TTL):
+        self.session = session
+        self.url = url
+        self.ttl = ttl
+        self.data = None
+        self.etag = None
+        self.last_modified = None
+        self.fetched_at = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.requests = 0
+        self.not_modified = 0
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self._inflight = None
+
+    @property
+    def is_stale(self) -> bool:
+        return time.monotonic() - self.fetched_at > self.ttl
+
+    def peek(self):
+        """Return the cached payload without waiting, revalidating in the background when stale."""
+        if self.data is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+        if self.is_stale:
+            self.refresh_in_background()
+        return self.data
+
+    async def get(self):
+        """Return the cached payload, only waiting on the API when nothing is cached yet."""
+        if self.data is None:
+            self.misses += 1
+            return await self.refresh()
+        self.hits += 1
+        if self.is_stale:
+            self.refresh_in_background()
+        return self.data
+
+    async def refresh(self):
+        """Revalidate the payload, joining any request that is already in flight."""
+        if self._inflight is None:
+            self._inflight = asyncio.ensure_future(self._fetch())
+            self._inflight.add_done_callback(self._clear_inflight)
+        return await asyncio.shield(self._inflight)
+
+    def refresh_in_background(self):
+        if self._inflight is None:
+            asyncio.ensure_future(self.refresh())
+
+    def _clear_inflight(self, future):
+        self._inflight = None
+
+    async def _fetch(self):
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        self.requests += 1
+        started = time.monotonic()
+        try:
+            async with self.session.get(self.url, headers=headers) as response:
+                if response.status == 304:
+                    self.not_modified += 1
+                    self.fetched_at = time.monotonic()
+                elif response.status == 200:
+                    self.data = await response.json()
+                    self.etag = response.headers.get("ETag")
+                    self.last_modified = response.headers.get("Last-Modified")
+                    self.fetched_at = time.monotonic()
+                else:
+                    logger.error(f"API returned status {response.status}")
+        except Exception as e:
+            logger.error(f"Error fetching track data: {e}")
+        self.latency.observe(time.monotonic() - started)
+        return self.data
@@ -0,0 +1,267 @@
+import asyncio
+import bisect
+import os
+import time
+
+from aiohttp import web
+
+from bot.utils.logger import get_logger
+from bot.utils.presence import broadcast_source
+
+logger = get_logger("Metrics")
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 9108
+# How often the event loop is woken to measure how late it runs.
+LAG_INTERVAL = 0.5
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.02, 0.05, 0.1, 0.25, 0.5, 1.0)
+ENCODE_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.02)
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+try:
+    _CLOCK_TICKS = os.sysconf("SC_CLK_TCK")
+    _PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+except (AttributeError, ValueError, OSError):
+    _CLOCK_TICKS = _PAGE_SIZE = None
+
+class Histogram:
+    """Bucketed distribution of observed values, cheap enough to update once per frame.
+
+    Updates are plain integer and float increments with no locking; a scrape
+    racing a writer thread may see ``sum`` and ``count`` one observation apart.
+    """
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+def process_stats(pid: int):
+    """Return ``(cpu_seconds, resident_bytes)`` for ``pid`` from ``/proc``, or ``None`` if unavailable."""
+    if pid is None or _CLOCK_TICKS is None:
+        return None
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            # Fields after the parenthesised command name, starting at the process state.
+            fields = f.read().rpartition(")")[2].split()
+    except OSError:
+        return None
+    return (int(fields[11]) + int(fields[12])) / _CLOCK_TICKS, int(fields[21]) * _PAGE_SIZE
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+class _Exposition:
+    """Builds a scrape response in the Prometheus text format."""
+
+    def __init__(self):
+        self.lines = []
+
+    def header(self, name: str, kind: str, text: str):
+        self.lines.append(f"# HELP {name} {text}")
+        self.lines.append(f"# TYPE {name} {kind}")
+
+    def sample(self, name: str, value, labels: dict = None):
+        self.lines.append(f"{name}{_labels(labels)} {value}")
+
+    def histogram(self, name: str, histogram: Histogram, labels: dict = None):
+        labels = labels or {}
+        cumulative = 0
+        for bound, count in zip(histogram.buckets, histogram.counts):
+            cumulative += count
+            self.sample(f"{name}_bucket", cumulative, {**labels, "le": bound})
+        self.sample(f"{name}_bucket", histogram.count, {**labels, "le": "+Inf"})
+        self.sample(f"{name}_sum", histogram.sum, labels)
+        self.sample(f"{name}_count", histogram.count, labels)
+
+    def render(self) -> str:
+        return "\n".join(self.lines) + "\n"
+
+class BotMetrics:
+    """Serve the bot's audio, API and command metrics in the Prometheus text format.
+
+    Hot paths only bump counters and histograms on the objects that own them;
+    everything else is read from live state when the endpoint is scraped, so
+    an idle endpoint costs nothing beyond the event-loop lag probe.
+    """
+
+    def __init__(self, bot, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+        self.bot = bot
+        self.host = host
+        self.port = port
+        self.loop_lag = Histogram(LAG_BUCKETS)
+        self.last_loop_lag = 0.0
+        self.command_latency = {}
+        self.command_errors = {}
+        self.first_frame = Histogram(LATENCY_BUCKETS)
+        self._runner = None
+        self._lag_task = None
+
+    async def start(self):
+        if self._lag_task is None:
+            self._lag_task = asyncio.create_task(self._measure_lag())
+        if not self.port or self._runner is not None:
+            return
+        app = web.Application()
+        app.router.add_get("/metrics", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        try:
+            await web.TCPSite(self._runner, self.host, self.port).start()
+        except OSError as e:
+            logger.warning(f"Metrics endpoint unavailable on {self.host}:{self.port}: {e}")
+            return
+        logger.info(f"Serving metrics on http://{self.host}:{self.port}/metrics")
+
+    async def close(self):
+        if self._lag_task:
+            self._lag_task.cancel()
+            self._lag_task = None
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def observe_command(self, name: str, seconds: float, failed: bool = False):
+        histogram = self.command_latency.get(name)
+        if histogram is None:
+            histogram = self.command_latency[name] = Histogram(LATENCY_BUCKETS)
+        histogram.observe(seconds)
+        if failed:
+            self.command_errors[name] = self.command_errors.get(name, 0) + 1
+
+    def observe_first_frame(self, guild_id: int, seconds: float):
+        """Record how long a guild waited for its first audio frame; called from the audio thread."""
+        self.first_frame.observe(seconds)
+        logger.info(f"First audio frame in guild {guild_id} after {seconds:.2f}s")
+
+    async def _measure_lag(self):
+        while True:
+            expected = time.perf_counter() + LAG_INTERVAL
+            await asyncio.sleep(LAG_INTERVAL)
+            self.last_loop_lag = max(0.0, time.perf_counter() - expected)
+            self.loop_lag.observe(self.last_loop_lag)
+
+    async def _handle(self, request):
+        return web.Response(body=self.render().encode(), headers={"Content-Type": CONTENT_TYPE})
+
+    def render(self) -> str:
+        out = _Exposition()
+        self._render_process(out)
+        self._render_guilds(out)
+        self._render_stations(out)
+        self._render_commands(out)
+        return out.render()
+
+    def _render_process(self, out: _Exposition):
+        out.header("radbot_event_loop_lag_seconds", "histogram", "How late the event loop woke from a timed sleep.")
+        out.histogram("radbot_event_loop_lag_seconds", self.loop_lag)
+        out.header("radbot_event_loop_lag_last_seconds", "gauge", "Most recent event loop lag sample.")
+        out.sample("radbot_event_loop_lag_last_seconds", self.last_loop_lag)
+        if self.bot.time_to_ready is not None:
+            out.header("radbot_time_to_ready_seconds", "gauge", "Time from startup to the first ready event.")
+            out.sample("radbot_time_to_ready_seconds", self.bot.time_to_ready)
+        stats = process_stats(os.getpid())
+        if stats:
+            out.header("radbot_process_cpu_seconds_total", "counter", "CPU time used by the bot process.")
+            out.sample("radbot_process_cpu_seconds_total", stats[0])
+            out.header("radbot_process_resident_memory_bytes", "gauge", "Resident memory of the bot process.")
+            out.sample("radbot_process_resident_memory_bytes", stats[1])
+
+    def _render_guilds(self, out: _Exposition):
+        rows = []
+        for guild_id, voice_client in list(self.bot.my_voice_clients.items()):
+            source = broadcast_source(voice_client)
+            if hasattr(source, "frames_read"):
+                labels = {"guild": guild_id, "station": self.bot.stations.for_guild(guild_id).key}
+                rows.append((labels, source))
+        out.header("radbot_guilds_playing", "gauge", "Guilds with an active voice connection.")
+        out.sample("radbot_guilds_playing", len(self.bot.my_voice_clients))
+        for name, attribute, text in (
+            ("radbot_frames_sent_total", "frames_read", "Audio frames handed to the voice client."),
+            ("radbot_frames_late_total", "frames_late", "Frames read more than one and a half frame periods late."),
+            ("radbot_frames_concealed_total", "frames_concealed", "Frames replaced by repeats or silence."),
+        ):
+            out.header(name, "counter", text)
+            for labels, source in rows:
+                out.sample(name, getattr(source, attribute), labels)
+        out.header("radbot_first_audio_frame_seconds", "gauge", "Time from /play to a guild's first audio frame.")
+        for labels, source in rows:
+            if source.first_frame_delay is not None:
+                out.sample("radbot_first_audio_frame_seconds", source.first_frame_delay, labels)
+        out.header("radbot_time_to_first_audio_frame_seconds", "histogram",
+                   "Time from /play or resume to the first audio frame, across all playbacks.")
+        out.histogram("radbot_time_to_first_audio_frame_seconds", self.first_frame)
+
+    def _render_stations(self, out: _Exposition):
+        active = self.bot.stations.active
+        ingests = [(station, process_stats(station.broadcast.ingest_pid)) for station in active]
+        ingests = [(station, stats) for station, stats in ingests if stats]
+        out.header("radbot_ffmpeg_processes", "gauge", "Running FFmpeg ingest processes.")
+        out.sample("radbot_ffmpeg_processes", len(ingests))
+        out.header("radbot_ffmpeg_cpu_seconds_total", "counter", "CPU time used by a station's FFmpeg ingest.")
+        for station, stats in ingests:
+            out.sample("radbot_ffmpeg_cpu_seconds_total", stats[0], {"station": station.key})
+        out.header("radbot_ffmpeg_resident_memory_bytes", "gauge", "Resident memory of a station's FFmpeg ingest.")
+        for station, stats in ingests:
+            out.sample("radbot_ffmpeg_resident_memory_bytes", stats[1], {"station": station.key})
+
+        out.header("radbot_opus_encode_seconds", "histogram", "Time to scale and Opus-encode one frame in-process.")
+        for station in active:
+            out.histogram("radbot_opus_encode_seconds", station.broadcast.encode_time, {"station": station.key})
+        out.header("radbot_broadcast_listeners", "gauge", "Listeners attached to a station's broadcast.")
+        for station in active:
+            out.sample("radbot_broadcast_listeners", station.broadcast.listener_count, {"station": station.key})
+        out.header("radbot_broadcast_underruns_total", "counter", "Reads that found no new frame in time.")
+        for station in active:
+            out.sample("radbot_broadcast_underruns_total", station.broadcast.underruns, {"station": station.key})
+
+        caches = [station for station in self.bot.stations if station.track_cache]
+        out.header("radbot_metadata_request_seconds", "histogram", "Track metadata request latency, to the RadioKing API or the cluster's track feed.")
+        for station in caches:
+            out.histogram("radbot_metadata_request_seconds", station.track_cache.latency, {"station": station.key})
+        for name, attribute, text in (
+            ("radbot_metadata_cache_hits_total", "hits", "Track lookups served from the metadata cache."),
+            ("radbot_metadata_cache_misses_total", "misses", "Track lookups that found the metadata cache empty."),
+        ):
+            out.header(name, "counter", text)
+            for station in caches:
+                out.sample(name, getattr(station.track_cache, attribute), {"station": station.key})
+        out.header("radbot_metadata_cache_hit_ratio", "gauge", "Share of track lookups served from the cache.")
+        for station in caches:
+            cache = station.track_cache
+            lookups = cache.hits + cache.misses
+            out.sample("radbot_metadata_cache_hit_ratio", cache.hits / lookups if lookups else 0, {"station": station.key})
+
+        schedulers = [station for station in self.bot.stations if hasattr(station.poller, "detection_latency")]
+        out.header("radbot_track_change_detection_seconds", "summary",
+                   "Delay between a track's expected end and its change being seen.")
+        for station in schedulers:
+            labels = {"station": station.key}
+            out.sample("radbot_track_change_detection_seconds_sum", station.poller.total_detection_latency, labels)
+            out.sample("radbot_track_change_detection_seconds_count", station.poller.changes, labels)
+        out.header("radbot_metadata_poll_requests_total", "counter",
+                   "RadioKing API requests made by a station's track-change poller.")
+        for station in schedulers:
+            out.sample("radbot_metadata_poll_requests_total", station.poller.requests, {"station": station.key})
+
+    def _render_commands(self, out: _Exposition):
+        out.header("radbot_command_seconds", "histogram", "Slash command handling latency.")
+        for name, histogram in sorted(self.command_latency.items()):
+            out.histogram("radbot_command_seconds", histogram, {"command": name})
+        out.header("radbot_command_errors_total", "counter", "Slash commands that raised an error.")
+        for name, count in sorted(self.command_errors.items()):
+            out.sample("radbot_command_errors_total", count, {"command": name})
@@ -0,0 +1,86 @@
+import asyncio
+import time
+
+import discord
+
+from bot.utils.logger import get_logger
+
+logger = get_logger("NowPlayingDispatcher")
+
+MAX_CONCURRENCY = 25
+# Discord allows 50 requests per second globally; leave headroom for commands.
+GLOBAL_RATE = 40
+
+class _RateLimiter:
+    """Token bucket spacing requests to stay under the global rate limit."""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.tokens = rate
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+class NowPlayingDispatcher:
+    """Fan a now-playing announcement out to every active channel concurrently.
+
+    Sends run with bounded parallelism and are paced by a global token bucket;
+    discord.py keeps handling the per-route buckets and any 429 responses.
+    Dispatching a newer announcement for the same ``key`` (a station) cancels
+    whatever is left of the previous one, so listeners never receive a stale track.
+    """
+
+    def __init__(self, concurrency: int = MAX_CONCURRENCY, rate: float = GLOBAL_RATE):
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._limiter = _RateLimiter(rate)
+        self._tasks = {}
+        self.sent = 0
+        self.failed = 0
+        self.dropped = 0
+        self.last_duration = None
+
+    def dispatch(self, channels, content: str, embed: discord.Embed, key=None) -> asyncio.Task:
+        """Start announcing to ``channels``, superseding any announcement for ``key`` still in progress."""
+        task = self._tasks.get(key)
+        if task and not task.done():
+            task.cancel()
+            logger.info("Dropped the rest of a stale now-playing broadcast")
+        task = self._tasks[key] = asyncio.create_task(self._broadcast(list(channels), content, embed))
+        return task
+
+    async def _broadcast(self, channels, content, embed):
+        started = time.monotonic()
+        tasks = [asyncio.create_task(self._send(channel, content, embed)) for channel in channels]
+        try:
+            await asyncio.gather(*tasks)
+        except asyncio.CancelledError:
+            for task in tasks:
+                task.cancel()
+            raise
+        self.last_duration = time.monotonic() - started
+        logger.info(f"Announced track to {len(channels)} channel(s) in {self.last_duration:.2f}s")
+
+    async def _send(self, channel, content, embed):
+        try:
+            async with self._semaphore:
+                await self._limiter.acquire()
+                await channel.send(content, embed=embed)
+                self.sent += 1
+        except asyncio.CancelledError:
+            self.dropped += 1
+            raise
+        except Exception as e:
+            # HTTP errors, but also connection resets and timeouts from aiohttp; one
+            # channel failing must not abort the rest of the broadcast.
+            self.failed += 1
+            logger.warning(f"Failed to announce track in channel {channel.id}: {e}")
@@ -0,0 +1,82 @@
+import asyncio
+
+from bot.utils.logger import get_logger
+
+logger = get_logger("ListenerMonitor")
+
+# Seconds with no human listeners before the guild's pipeline is paused.
+PAUSE_GRACE = 30.0
+# Seconds with no human listeners before the bot leaves the channel.
+DISCONNECT_TIMEOUT = 300.0
+
+def count_humans(channel) -> int:
+    return sum(1 for member in channel.members if not member.bot)
+
+def broadcast_source(voice_client):
+    """Return the shared-broadcast cursor behind a voice client's source, if any."""
+    source = voice_client.source
+    return getattr(source, "original", source)
+
+class ListenerMonitor:
+    """Pause guilds whose voice channel has no human listeners and resume them when someone returns.
+
+    A paused guild is detached from the shared broadcast, so it costs no encode
+    work; once every guild is detached the broadcast shuts its ingest down.
+    """
+
+    def __init__(self, bot, pause_grace: float = PAUSE_GRACE, disconnect_timeout: float = DISCONNECT_TIMEOUT):
+        self.bot = bot
+        self.pause_grace = pause_grace
+        self.disconnect_timeout = disconnect_timeout
+        self.human_counts = {}
+        self._timers = {}
+
+    def update(self, guild):
+        """Recount the humans in the bot's channel for ``guild`` and react to the change."""
+        voice_client = self.bot.my_voice_clients.get(guild.id)
+        if voice_client is None or voice_client.channel is None:
+            self.forget(guild.id)
+            return
+        humans = count_humans(voice_client.channel)
+        self.human_counts[guild.id] = humans
+        if humans:
+            self._cancel_timer(guild.id)
+            if voice_client.is_paused():
+                self._resume(voice_client)
+                logger.info(f"Listener returned in guild {guild.id}, resumed playback")
+        elif guild.id not in self._timers:
+            self._timers[guild.id] = asyncio.create_task(self._idle(guild.id, voice_client))
+
+    def forget(self, guild_id: int):
+        self._cancel_timer(guild_id)
+        self.human_counts.pop(guild_id, None)
+
+    def _cancel_timer(self, guild_id: int):
+        timer = self._timers.pop(guild_id, None)
+        if timer:
+            timer.cancel()
+
+    def _pause(self, voice_client):
+        voice_client.pause()
+        source = broadcast_source(voice_client)
+        if hasattr(source, "broadcast"):
+            source.broadcast.detach(source)
+
+    def _resume(self, voice_client):
+        source = broadcast_source(voice_client)
+        if hasattr(source, "broadcast"):
+            source.broadcast.attach(source)
+        voice_client.resume()
+
+    async def _idle(self, guild_id: int, voice_client):
+        try:
+            await asyncio.sleep(self.pause_grace)
+            if voice_client.is_playing():
+                self._pause(voice_client)
+                logger.info(f"No listeners in guild {guild_id} for {self.pause_grace:.0f}s, paused playback")
+            await asyncio.sleep(max(0.0, self.disconnect_timeout - self.pause_grace))
+            logger.info(f"No listeners in guild {guild_id} for {self.disconnect_timeout:.0f}s, disconnecting")
+            self._timers.pop(guild_id, None)
+            await voice_client.disconnect()
+        except asyncio.CancelledError:
+            pass
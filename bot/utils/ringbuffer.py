@@ -0,0 +1,101 @@
+from array import array
+from multiprocessing import shared_memory
+
+class FrameRing:
+    """Fixed-capacity ring of preallocated frame slots addressed by absolute position.
+
+    Frames are written in place into a single ``bytearray`` and read back as
+    ``memoryview`` slices, so neither side allocates per frame. One slot is
+    always reserved for the writer, which means a view handed to a reader stays
+    valid until ``slots - 1`` newer frames have been written. Callers are
+    responsible for locking around ``commit`` and reads.
+    """
+
+    def __init__(self, slots: int, slot_size: int):
+        self.slots = slots
+        self.slot_size = slot_size
+        self._buffer = bytearray(slots * slot_size)
+        self._view = memoryview(self._buffer)
+        self._lengths = array("I", bytes(4 * slots))
+        self.head = 0
+
+    @property
+    def oldest(self) -> int:
+        """Position of the oldest frame that is still readable."""
+        return max(0, self.head - self.slots + 1)
+
+    def write_slot(self) -> memoryview:
+        """Writable view of the slot the next frame will occupy."""
+        offset = (self.head % self.slots) * self.slot_size
+        return self._view[offset:offset + self.slot_size]
+
+    def commit(self, length: int):
+        """Publish the frame written into :meth:`write_slot`."""
+        self._lengths[self.head % self.slots] = length
+        self.head += 1
+
+    def write(self, data):
+        length = len(data)
+        if length > self.slot_size:
+            raise ValueError(f"frame of {length} bytes does not fit a {self.slot_size} byte slot")
+        self.write_slot()[:length] = data
+        self.commit(length)
+
+    def read(self, position: int) -> memoryview:
+        index = position % self.slots
+        offset = index * self.slot_size
+        return self._view[offset:offset + self._lengths[index]]
+
+def _attach_shared_memory(name: str) -> shared_memory.SharedMemory:
+    """Attach to an existing block that another process created and will unlink."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Before Python 3.13 attaching always registers the block, but spawned workers
+        # share the creator's resource tracker so that registration is harmless.
+        return shared_memory.SharedMemory(name=name)
+
+class SharedFrameRing(FrameRing):
+    """A :class:`FrameRing` stored in shared memory so another process can read or write it.
+
+    The block holds the head position, the slot lengths and the slots themselves.
+    The creating process owns the block and unlinks it on :meth:`close`; other
+    processes attach by ``name``.
+    """
+
+    def __init__(self, slots: int, slot_size: int, name: str = None):
+        self.slots = slots
+        self.slot_size = slot_size
+        size = 8 + 4 * slots + slots * slot_size
+        self.owner = name is None
+        if self.owner:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            self.shm = _attach_shared_memory(name)
+        buf = self.shm.buf
+        self._head = buf[:8].cast("Q")
+        self._lengths = buf[8:8 + 4 * slots].cast("I")
+        self._view = buf[8 + 4 * slots:size]
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    @property
+    def head(self) -> int:
+        return self._head[0]
+
+    @head.setter
+    def head(self, value: int):
+        self._head[0] = value
+
+    def close(self):
+        for view in (self._head, self._lengths, self._view):
+            view.release()
+        try:
+            self.shm.close()
+        except BufferError:
+            # A reader still holds a frame view; the mapping goes away with it.
+            pass
+        if self.owner:
+            self.shm.unlink()
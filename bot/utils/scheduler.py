@@ -0,0 +1,129 @@
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+
+from bot.utils.logger import get_logger
+from bot.utils.metadata import track_key
+
+logger = get_logger("TrackScheduler")
+
+# Polling starts this long after the expected end, giving the API time to catch up.
+END_GRACE = 1.0
+MIN_POLL = 2.0
+MAX_POLL = 30.0
+# Used when the payload carries no usable timing information.
+FALLBACK_INTERVAL = 60.0
+
+def _parse_time(value):
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+def seconds_until_end(track_data):
+    """Seconds until the track is expected to end, or ``None`` if the payload does not say."""
+    if not track_data:
+        return None
+    end_at = _parse_time(track_data.get('end_at'))
+    if end_at is None:
+        started_at = _parse_time(track_data.get('started_at'))
+        duration = track_data.get('duration')
+        if started_at is None or not duration:
+            return None
+        end_at = started_at + timedelta(seconds=float(duration))
+    return (end_at - datetime.now(timezone.utc)).total_seconds()
+
+class TrackChangeScheduler:
+    """Watch for track changes by sleeping until the current track should end.
+
+    Once the expected end has passed, the API is polled with exponential backoff
+    until the track changes. ``detection_latency`` is the time between the
+    expected end and the change being seen, and ``requests`` counts every API
+    call, so both can be compared with a fixed polling loop.
+    """
+
+    def __init__(self, fetch, on_change, min_poll: float = MIN_POLL, max_poll: float = MAX_POLL,
+                 fallback_interval: float = FALLBACK_INTERVAL):
+        self.fetch = fetch
+        self.on_change = on_change
+        self.min_poll = min_poll
+        self.max_poll = max_poll
+        self.fallback_interval = fallback_interval
+        self.current = None
+        self.requests = 0
+        self.changes = 0
+        self.detection_latency = None
+        self.total_detection_latency = 0.0
+        self._task = None
+
+    @property
+    def average_detection_latency(self):
+        if not self.changes:
+            return None
+        return self.total_detection_latency / self.changes
+
+    def stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "changes": self.changes,
+            "last_detection_latency": self.detection_latency,
+            "average_detection_latency": self.average_detection_latency,
+        }
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        # A restarted scheduler fetches a fresh track rather than resuming from a stale one.
+        self.current = None
+
+    async def _poll(self):
+        self.requests += 1
+        return await self.fetch()
+
+    def _next_delay(self):
+        remaining = seconds_until_end(self.current)
+        if remaining is None:
+            return self.fallback_interval
+        return max(remaining + END_GRACE, self.min_poll)
+
+    async def _run(self):
+        while self.current is None:
+            self.current = await self._poll()
+            if self.current is None:
+                await asyncio.sleep(self.min_poll)
+        await self.on_change(None, self.current)
+        while True:
+            delay = self._next_delay()
+            expected_change = time.monotonic() + delay - END_GRACE
+            await asyncio.sleep(delay)
+            backoff = self.min_poll
+            while True:
+                try:
+                    new_track = await self._poll()
+                except Exception as e:
+                    logger.error(f"Error polling current track: {e}")
+                    new_track = None
+                if new_track and track_key(new_track) != track_key(self.current):
+                    break
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, self.max_poll)
+            self.detection_latency = max(0.0, time.monotonic() - expected_change)
+            self.total_detection_latency += self.detection_latency
+            self.changes += 1
+            logger.info(f"Detected track change {self.detection_latency:.1f}s after expected end "
+                        f"({self.requests} API requests so far)")
+            previous, self.current = self.current, new_track
+            try:
+                await self.on_change(previous, new_track)
+            except Exception as e:
+                logger.error(f"Error handling track change: {e}")
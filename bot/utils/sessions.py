@@ -0,0 +1,147 @@
+import asyncio
+import os
+import random
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+from bot.utils.logger import get_logger
+
+logger = get_logger("SessionStore")
+
+# SQLite database of active sessions, overridden by RADBOT_SESSION_DB; see "Persistent files" in the README.
+DEFAULT_PATH = "radio_monash_sessions.db"
+RESUME_BATCH_SIZE = 5
+RESUME_BATCH_INTERVAL = 2.0
+RESUME_JITTER = 1.0
+
+Session = namedtuple("Session", ["guild_id", "voice_channel_id", "text_channel_id", "volume", "station"])
+
+class SessionStore:
+    """SQLite-backed record of where the bot is playing, used to resume after a restart.
+
+    Queries run on a worker thread so the event loop never waits on disk I/O.
+    """
+
+    def __init__(self, path: str = None):
+        # Read at construction rather than import so a value from .env is honoured.
+        path = path or os.getenv("RADBOT_SESSION_DB", DEFAULT_PATH)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            "guild_id INTEGER PRIMARY KEY, "
+            "voice_channel_id INTEGER NOT NULL, "
+            "text_channel_id INTEGER, "
+            "volume REAL NOT NULL, "
+            "updated_at REAL NOT NULL, "
+            "station TEXT)"
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(sessions)")}
+        if "station" not in columns:
+            # Databases written before stations were selectable resume on the default station.
+            self._conn.execute("ALTER TABLE sessions ADD COLUMN station TEXT")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        self._conn.commit()
+
+    def _execute(self, query: str, params=()):
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+            self._conn.commit()
+            return rows
+
+    async def save(self, guild_id: int, voice_channel_id: int, text_channel_id: int, volume: float,
+                   station: str = None):
+        await asyncio.to_thread(
+            self._execute,
+            "INSERT OR REPLACE INTO sessions "
+            "(guild_id, voice_channel_id, text_channel_id, volume, updated_at, station) VALUES (?, ?, ?, ?, ?, ?)",
+            (guild_id, voice_channel_id, text_channel_id, volume, time.time(), station)
+        )
+
+    async def update_volume(self, guild_id: int, volume: float):
+        await asyncio.to_thread(
+            self._execute,
+            "UPDATE sessions SET volume = ?, updated_at = ? WHERE guild_id = ?",
+            (volume, time.time(), guild_id)
+        )
+
+    async def remove(self, guild_id: int):
+        await asyncio.to_thread(self._execute, "DELETE FROM sessions WHERE guild_id = ?", (guild_id,))
+
+    async def load_all(self) -> list:
+        rows = await asyncio.to_thread(
+            self._execute,
+            "SELECT guild_id, voice_channel_id, text_channel_id, volume, station FROM sessions ORDER BY updated_at"
+        )
+        return [Session(*row) for row in rows]
+
+    async def get_meta(self, key: str):
+        rows = await asyncio.to_thread(self._execute, "SELECT value FROM meta WHERE key = ?", (key,))
+        return rows[0][0] if rows else None
+
+    async def set_meta(self, key: str, value: str):
+        await asyncio.to_thread(self._execute, "INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, value))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+class ResumeReport:
+    """Progress and timing of one auto-resume run."""
+
+    def __init__(self, total: int):
+        self.total = total
+        self.resumed = 0
+        self.failures = {}
+        self.started_at = time.monotonic()
+        self.finished_at = None
+
+    @property
+    def done(self) -> int:
+        return self.resumed + len(self.failures)
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    def __str__(self) -> str:
+        return (f"{self.resumed}/{self.total} session(s) resumed, {len(self.failures)} failed "
+                f"in {self.elapsed:.1f}s")
+
+async def resume_sessions(bot, store: SessionStore, batch_size: int = RESUME_BATCH_SIZE,
+                          batch_interval: float = RESUME_BATCH_INTERVAL, jitter: float = RESUME_JITTER) -> ResumeReport:
+    """Reconnect stored sessions in paced, jittered batches so the voice gateway is not stampeded."""
+    # In cluster mode every process shares the store; only resume our own shards' guilds.
+    sessions = [session for session in await store.load_all() if bot.owns_guild(session.guild_id)]
+    report = ResumeReport(len(sessions))
+    if not sessions:
+        return report
+    logger.info(f"Resuming {len(sessions)} session(s) in batches of {batch_size}")
+
+    async def resume_one(session: Session):
+        await asyncio.sleep(random.uniform(0, jitter))
+        try:
+            channel = bot.get_channel(session.voice_channel_id)
+            if channel is None or channel.guild.id != session.guild_id:
+                raise LookupError("voice channel no longer exists")
+            await bot.start_playback(channel, session.text_channel_id, session.volume, session.station)
+            report.resumed += 1
+        except Exception as e:
+            report.failures[session.guild_id] = str(e)
+            logger.warning(f"Failed to resume session in guild {session.guild_id}: {e}")
+            if isinstance(e, LookupError):
+                await store.remove(session.guild_id)
+
+    for start in range(0, len(sessions), batch_size):
+        await asyncio.gather(*(resume_one(session) for session in sessions[start:start + batch_size]))
+        logger.info(f"Resume progress: {report}")
+        if start + batch_size < len(sessions):
+            await asyncio.sleep(batch_interval)
+    report.finished_at = time.monotonic()
+    logger.info(f"Resume finished: {report}")
+    return report
@@ -0,0 +1,227 @@
+import os
+
+from bot.utils.broadcast import CONCEAL_REPEAT, TARGET_DEPTH, RadioBroadcast
+from bot.utils.embeds import TrackEmbedCache
+from bot.utils.history import TrackHistory, history_path
+from bot.utils.logger import get_logger
+from bot.utils.metadata import TrackMetadataCache
+from bot.utils.scheduler import TrackChangeScheduler
+from bot.utils.supervisor import StreamSupervisor
+from bot.utils.trackfeed import FeedTrackCache, TrackFeedClient
+
+logger = get_logger("Stations")
+
+STREAM_URL_TEMPLATE = "https://play.radioking.io/{slug}"
+API_URL_TEMPLATE = "https://api.radioking.io/widget/radio/{slug}"
+DEFAULT_STATION = "radio-monash"
+# Discord allows at most 25 choices on a slash command option.
+MAX_STATIONS = 25
+
+class StationConfig:
+    """Where to find one RadioKing station's stream and metadata."""
+
+    __slots__ = ("key", "name", "website", "fallback_stream_urls")
+
+    def __init__(self, key: str, name: str, website: str = None, fallback_stream_urls=()):
+        self.key = key
+        self.name = name
+        self.website = website
+        # Alternate mounts tried in turn when the primary stream stalls.
+        self.fallback_stream_urls = list(fallback_stream_urls)
+
+    @property
+    def stream_url(self) -> str:
+        return STREAM_URL_TEMPLATE.format(slug=self.key)
+
+    @property
+    def api_url(self) -> str:
+        return API_URL_TEMPLATE.format(slug=self.key)
+
+    @property
+    def track_url(self) -> str:
+        return f"{self.api_url}/track/current"
+
+def parse_fallback_streams(spec: str) -> dict:
+    """Parse ``slug=url|url;slug=url`` into the alternate mounts for each station."""
+    fallbacks = {}
+    for entry in spec.split(";"):
+        slug, _, urls = entry.partition("=")
+        urls = [url.strip() for url in urls.split("|") if url.strip()]
+        if slug.strip() and urls:
+            fallbacks.setdefault(slug.strip(), []).extend(urls)
+    return fallbacks
+
+def load_stations(spec: str = None, fallback_spec: str = None) -> dict:
+    """Build the station list from ``RADBOT_STATIONS`` and ``RADBOT_FALLBACK_STREAMS``.
+
+    ``RADBOT_STATIONS`` is a comma-separated list of ``slug=Display Name``
+    entries, one per RadioKing station. Radio Monash is always available and
+    listed first. ``RADBOT_FALLBACK_STREAMS`` gives each station alternate
+    mounts for the supervisor to fail over to, as ``slug=url|url`` entries
+    separated by semicolons.
+    """
+    if spec is None:
+        spec = os.getenv("RADBOT_STATIONS", "")
+    if fallback_spec is None:
+        fallback_spec = os.getenv("RADBOT_FALLBACK_STREAMS", "")
+    stations = {DEFAULT_STATION: StationConfig(DEFAULT_STATION, "Radio Monash", website="radiomonash.online")}
+    for entry in spec.split(","):
+        slug, _, name = entry.partition("=")
+        slug = slug.strip()
+        if slug and slug not in stations:
+            stations[slug] = StationConfig(slug, name.strip() or slug)
+    if len(stations) > MAX_STATIONS:
+        logger.warning(f"Only the first {MAX_STATIONS} of {len(stations)} configured stations will be offered")
+        stations = dict(list(stations.items())[:MAX_STATIONS])
+    for slug, urls in parse_fallback_streams(fallback_spec).items():
+        if slug in stations:
+            stations[slug].fallback_stream_urls.extend(urls)
+        else:
+            logger.warning(f"Ignoring fallback streams for unknown station {slug!r}")
+    return stations
+
+class Station:
+    """One station and the shared resources used by the guilds listening to it.
+
+    The track poller and stream supervisor run only while at least one guild is
+    subscribed. The broadcast starts its ingest on the first listener and shuts
+    it down, along with any encoder workers, once it has been idle for a while.
+    """
+
+    def __init__(self, config: StationConfig, on_track_change, encode_workers: int = 0, track_feed: str = None,
+                 target_depth: int = TARGET_DEPTH, conceal: str = CONCEAL_REPEAT):
+        self.config = config
+        self.key = config.key
+        self.name = config.name
+        self.broadcast = RadioBroadcast(config.stream_url, target_depth=target_depth, conceal=conceal,
+                                        encode_workers=encode_workers)
+        self.supervisor = StreamSupervisor(self.broadcast, [config.stream_url, *config.fallback_stream_urls])
+        self.embed_cache = TrackEmbedCache(station_name=config.name, website=config.website)
+        # Leave RADBOT_HISTORY_FILE unset to keep history in memory only; each station gets its own file.
+        history_file = os.getenv("RADBOT_HISTORY_FILE")
+        self.history = TrackHistory(
+            path=history_path(history_file, config.key) if history_file else None,
+            station_name=config.name
+        )
+        self.current_track = None
+        self.track_cache = None
+        self.poller = None
+        self.guilds = set()
+        self._on_track_change = on_track_change
+        self._track_feed = track_feed
+
+    @property
+    def is_active(self) -> bool:
+        return bool(self.guilds)
+
+    def open(self, http_session):
+        """Create the metadata cache and track poller once the HTTP session exists."""
+        # Cluster processes get track changes and lookups from the launcher instead of the API.
+        if self._track_feed:
+            self.track_cache = FeedTrackCache(self._track_feed, self.key)
+            self.poller = TrackFeedClient(self._track_feed, self._track_changed, station=self.key)
+        else:
+            self.track_cache = TrackMetadataCache(http_session, self.config.track_url)
+            self.poller = TrackChangeScheduler(self.track_cache.refresh, self._track_changed)
+        # Warm the metadata cache so commands can answer from memory.
+        self.track_cache.refresh_in_background()
+
+    def subscribe(self, guild_id: int):
+        first = not self.guilds
+        self.guilds.add(guild_id)
+        if first:
+            self.poller.start()
+            self.supervisor.start()
+            logger.info(f"Station {self.key} is now active")
+
+    def unsubscribe(self, guild_id: int):
+        if guild_id not in self.guilds:
+            return
+        self.guilds.discard(guild_id)
+        if not self.guilds:
+            self.poller.stop()
+            self.supervisor.stop()
+            # Nothing keeps this up to date any more; lookups fall back to the revalidating cache.
+            self.current_track = None
+            logger.info(f"Station {self.key} has no guilds left, stopped polling")
+
+    def get_cached_track(self):
+        """Return the latest known track without waiting on the API."""
+        return self.current_track or self.track_cache.peek()
+
+    async def fetch_track(self):
+        """Return the latest known track, only waiting on the API when nothing is known yet."""
+        return self.current_track or await self.track_cache.get()
+
+    def get_rendered_track(self, track_data=None):
+        """Return the prebuilt embeds for a track, defaulting to the latest known one."""
+        return self.embed_cache.get(track_data or self.get_cached_track())
+
+    async def _track_changed(self, previous, new_track):
+        self.current_track = new_track
+        self.embed_cache.get(new_track)
+        await self._on_track_change(self, previous, new_track)
+        await self.history.record(new_track)
+
+    def close(self):
+        if self.poller:
+            self.poller.stop()
+        self.supervisor.stop()
+        self.broadcast.close()
+
+class StationRegistry:
+    """The configured stations and the one each guild is listening to."""
+
+    def __init__(self, configs: dict, on_track_change, encode_workers: int = 0, track_feed: str = None,
+                 target_depth: int = TARGET_DEPTH, conceal: str = CONCEAL_REPEAT):
+        self._stations = {
+            key: Station(config, on_track_change, encode_workers, track_feed, target_depth, conceal)
+            for key, config in configs.items()
+        }
+        self.default = DEFAULT_STATION if DEFAULT_STATION in self._stations else next(iter(self._stations))
+        self._guilds = {}
+
+    def __iter__(self):
+        return iter(self._stations.values())
+
+    def __len__(self) -> int:
+        return len(self._stations)
+
+    def __contains__(self, key) -> bool:
+        return key in self._stations
+
+    def __getitem__(self, key) -> Station:
+        return self._stations[key]
+
+    @property
+    def active(self) -> list:
+        """Stations with at least one guild listening."""
+        return [station for station in self if station.is_active]
+
+    def open(self, http_session):
+        for station in self:
+            station.open(http_session)
+
+    def for_guild(self, guild_id: int = None) -> Station:
+        """Return the station ``guild_id`` is listening to, or the default station."""
+        return self._stations[self._guilds.get(guild_id, self.default)]
+
+    def join(self, guild_id: int, key: str) -> Station:
+        """Subscribe a guild to a station, leaving whichever one it was on before."""
+        station = self._stations.get(key)
+        if station is None:
+            raise LookupError(f"unknown station {key!r}")
+        if self._guilds.get(guild_id) != key:
+            self.leave(guild_id)
+            self._guilds[guild_id] = key
+        station.subscribe(guild_id)
+        return station
+
+    def leave(self, guild_id: int):
+        key = self._guilds.pop(guild_id, None)
+        if key is not None:
+            self._stations[key].unsubscribe(guild_id)
+
+    def close(self):
+        for station in self:
+            station.close()
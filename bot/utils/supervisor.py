@@ -0,0 +1,130 @@
+import asyncio
+import time
+
+from discord.opus import Encoder as OpusEncoder
+
+from bot.utils.logger import get_logger
+
+logger = get_logger("StreamSupervisor")
+
+CHECK_INTERVAL = 0.5
+# No frames for this long means the upstream or FFmpeg has stalled.
+STALL_TIMEOUT = 3.0
+# Continuous dead air for this long is treated as a frozen stream.
+SILENCE_TIMEOUT = 30.0
+# Recent incidents kept for inspection.
+MAX_INCIDENTS = 50
+
+class StreamIncident:
+    """One stall of the shared ingest and how it was recovered."""
+
+    __slots__ = ("reason", "stream_url", "started_at", "restarted_at", "recovered_at", "failover_url",
+                 "frames_at_start", "frames_delivered")
+
+    def __init__(self, reason: str, stream_url: str, started_at: float, frames_at_start: int = 0):
+        self.reason = reason
+        self.stream_url = stream_url
+        self.started_at = started_at
+        self.restarted_at = None
+        self.recovered_at = None
+        self.failover_url = None
+        # Ingest frame counter when the incident was detected, and frames published until it recovered.
+        self.frames_at_start = frames_at_start
+        self.frames_delivered = None
+
+    @property
+    def time_to_recover(self):
+        if self.recovered_at is None:
+            return None
+        return self.recovered_at - self.started_at
+
+    @property
+    def frames_lost(self):
+        """Frames the ingest should have produced during the incident but did not."""
+        if self.recovered_at is None:
+            return None
+        expected = int(self.time_to_recover * 1000 / OpusEncoder.FRAME_LENGTH)
+        return max(0, expected - self.frames_delivered)
+
+class StreamSupervisor:
+    """Watch the shared ingest for stalls and dead air and hot-swap it when either occurs.
+
+    The broadcast keeps every listener attached and concealing while the ingest
+    is restarted, so voice clients stay connected and resume on their own once
+    frames flow again. Each restart rotates through ``stream_urls``, which lets
+    alternate mounts take over when the primary one is down.
+    """
+
+    def __init__(self, broadcast, stream_urls, stall_timeout: float = STALL_TIMEOUT,
+                 silence_timeout: float = SILENCE_TIMEOUT):
+        self.broadcast = broadcast
+        self.stream_urls = list(stream_urls)
+        self.stall_timeout = stall_timeout
+        self.silence_timeout = silence_timeout
+        self.incidents = []
+        self._incident = None
+        self._url_index = 0
+        self._task = None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(CHECK_INTERVAL)
+            try:
+                self.check()
+            except Exception as e:
+                logger.error(f"Error supervising stream: {e}")
+
+    def check(self):
+        broadcast = self.broadcast
+        if not broadcast.is_running or not broadcast.listener_count:
+            return
+        # Encoder workers die silently from the PCM side, so they are checked separately.
+        broadcast.check_workers()
+        now = time.monotonic()
+        if self._incident:
+            if self._incident.reason == "silence":
+                resumed_at, retry_after = broadcast.last_sound_at, self.silence_timeout
+            else:
+                resumed_at, retry_after = broadcast.last_frame_at, self.stall_timeout
+            if resumed_at and resumed_at > self._incident.restarted_at:
+                self._recovered(now)
+            elif now - self._incident.restarted_at > retry_after:
+                # The replacement has not produced audio either; move on to the next mount.
+                self._restart(now)
+            return
+        if now - broadcast.last_frame_at > self.stall_timeout:
+            self._begin("stall", broadcast.last_frame_at, now)
+        elif broadcast.last_sound_at and now - broadcast.last_sound_at > self.silence_timeout:
+            self._begin("silence", broadcast.last_sound_at, now)
+
+    def _begin(self, reason: str, started_at: float, now: float):
+        self._incident = StreamIncident(reason, self.broadcast.stream_url, started_at, self.broadcast.frames_published)
+        logger.warning(f"Ingest {reason} on {self.broadcast.stream_url} for {now - started_at:.1f}s, restarting")
+        self._restart(now)
+
+    def _restart(self, now: float):
+        if len(self.stream_urls) > 1:
+            self._url_index = (self._url_index + 1) % len(self.stream_urls)
+        url = self.stream_urls[self._url_index] if self.stream_urls else None
+        self._incident.restarted_at = now
+        self._incident.failover_url = url
+        self.broadcast.restart(url)
+
+    def _recovered(self, now: float):
+        incident, self._incident = self._incident, None
+        incident.recovered_at = now
+        incident.frames_delivered = self.broadcast.frames_published - incident.frames_at_start
+        self.broadcast.last_sound_at = now
+        self.incidents.append(incident)
+        del self.incidents[:-MAX_INCIDENTS]
+        logger.info(f"Ingest recovered on {self.broadcast.stream_url} after {incident.time_to_recover:.1f}s "
+                    f"(~{incident.frames_lost} frames lost)")
@@ -0,0 +1,213 @@
+import asyncio
+import json
+import time
+
+from bot.utils.logger import get_logger
+from bot.utils.metadata import DEFAULT_TTL, TrackMetadataCache, create_http_session
+from bot.utils.scheduler import TrackChangeScheduler
+
+logger = get_logger("TrackFeed")
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8790
+RECONNECT_DELAY = 1.0
+MAX_RECONNECT_DELAY = 30.0
+# Bytes a client may fall behind by before it is disconnected.
+MAX_CLIENT_BACKLOG = 1 << 20
+# Prefix of a one-shot request for a station's current track, as opposed to a subscription.
+LOOKUP_PREFIX = "?"
+LOOKUP_TIMEOUT = 10
+
+def _parse_address(address: str):
+    host, _, port = address.rpartition(":")
+    return host or DEFAULT_HOST, int(port)
+
+class _StationFeed:
+    """Track poller for one station and the clients subscribed to it."""
+
+    def __init__(self, session, api_url: str):
+        self.cache = TrackMetadataCache(session, api_url)
+        self.scheduler = TrackChangeScheduler(self.cache.refresh, self._publish)
+        self.current = None
+        self.clients = set()
+
+    async def _publish(self, previous, track):
+        self.current = track
+        self.send_all({"previous": previous, "track": track})
+
+    def send_all(self, message: dict):
+        line = (json.dumps(message) + "\n").encode()
+        for writer in list(self.clients):
+            if writer.transport.get_write_buffer_size() > MAX_CLIENT_BACKLOG:
+                logger.warning("Dropping a track feed client that stopped reading")
+                self.clients.discard(writer)
+                writer.close()
+                continue
+            writer.write(line)
+
+class TrackFeedServer:
+    """Poll the RadioKing API once per station and stream track changes to cluster processes.
+
+    A client subscribes by sending a station key on its own line. A station is
+    only polled while at least one client is subscribed to it. Messages are
+    newline-delimited JSON objects with ``previous`` and ``track`` keys; a new
+    subscriber first receives the current track with ``previous`` set to
+    ``None`` so it does not announce it.
+
+    A line of ``?`` followed by a station key is a one-shot lookup instead: the
+    server answers with that station's current track from its own cache and
+    closes the connection, so cluster processes never call the API themselves.
+    """
+
+    def __init__(self, api_urls: dict, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+        self.api_urls = dict(api_urls)
+        self.host = host
+        self.port = port
+        self.feeds = {}
+        self._session = None
+        self._server = None
+
+    async def start(self):
+        self._session = create_http_session()
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        logger.info(f"Track feed listening on {self.host}:{self.port}")
+
+    async def close(self):
+        for feed in self.feeds.values():
+            feed.scheduler.stop()
+            for writer in list(feed.clients):
+                writer.close()
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._session:
+            await self._session.close()
+
+    def _feed(self, station: str) -> _StationFeed:
+        feed = self.feeds.get(station)
+        if feed is None:
+            feed = self.feeds[station] = _StationFeed(self._session, self.api_urls[station])
+        return feed
+
+    def _subscribe(self, station: str, writer) -> _StationFeed:
+        feed = self._feed(station)
+        if not feed.clients:
+            feed.scheduler.start()
+            logger.info(f"Started polling {station} for the track feed")
+        feed.clients.add(writer)
+        if feed.current:
+            writer.write((json.dumps({"previous": None, "track": feed.current}) + "\n").encode())
+        return feed
+
+    def _unsubscribe(self, station: str, feed: _StationFeed, writer):
+        feed.clients.discard(writer)
+        if not feed.clients:
+            feed.scheduler.stop()
+            feed.current = None
+            logger.info(f"Stopped polling {station}, no track feed clients left")
+
+    async def _handle(self, reader, writer):
+        feed = None
+        try:
+            station = (await reader.readline()).decode().strip()
+            lookup = station.startswith(LOOKUP_PREFIX)
+            station = station.removeprefix(LOOKUP_PREFIX)
+            if station not in self.api_urls:
+                logger.warning(f"Track feed client asked for unknown station {station!r}")
+                return
+            if lookup:
+                station_feed = self._feed(station)
+                track = station_feed.current or await station_feed.cache.get()
+                writer.write((json.dumps({"previous": None, "track": track}) + "\n").encode())
+                await writer.drain()
+                return
+            feed = self._subscribe(station, writer)
+            while await reader.read(1024):
+                pass
+        except ConnectionError:
+            pass
+        finally:
+            if feed is not None:
+                self._unsubscribe(station, feed, writer)
+            writer.close()
+
+class TrackFeedClient:
+    """Receive one station's track changes from a :class:`TrackFeedServer` instead of polling the API.
+
+    Exposes the same ``start``/``stop`` interface as :class:`TrackChangeScheduler`.
+    """
+
+    def __init__(self, address: str, on_change, station: str):
+        self.host, self.port = _parse_address(address)
+        self.on_change = on_change
+        self.station = station
+        self.messages = 0
+        self._task = None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        delay = RECONNECT_DELAY
+        while True:
+            try:
+                reader, writer = await asyncio.open_connection(self.host, self.port)
+            except OSError as e:
+                logger.warning(f"Track feed unavailable ({e}), retrying in {delay:.0f}s")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, MAX_RECONNECT_DELAY)
+                continue
+            delay = RECONNECT_DELAY
+            logger.info(f"Connected to track feed for {self.station} at {self.host}:{self.port}")
+            try:
+                writer.write(f"{self.station}\n".encode())
+                async for line in reader:
+                    message = json.loads(line)
+                    self.messages += 1
+                    try:
+                        await self.on_change(message.get("previous"), message.get("track"))
+                    except Exception as e:
+                        logger.error(f"Error handling track change: {e}")
+            except (ConnectionError, ValueError) as e:
+                logger.warning(f"Track feed connection lost: {e}")
+            finally:
+                writer.close()
+            await asyncio.sleep(delay)
+
+class FeedTrackCache(TrackMetadataCache):
+    """A :class:`TrackMetadataCache` that asks the launcher's :class:`TrackFeedServer` instead of the API.
+
+    Cluster processes use it for lookups on stations they are not subscribed
+    to, so the launcher stays the only process talking to RadioKing.
+    """
+
+    def __init__(self, address: str, station: str, ttl: float = DEFAULT_TTL):
+        self.host, self.port = _parse_address(address)
+        self.station = station
+        super().__init__(None, f"feed://{self.host}:{self.port}/{station}", ttl)
+
+    async def _fetch(self):
+        self.requests += 1
+        started = time.monotonic()
+        writer = None
+        try:
+            reader, writer = await asyncio.wait_for(asyncio.open_connection(self.host, self.port), LOOKUP_TIMEOUT)
+            writer.write(f"{LOOKUP_PREFIX}{self.station}\n".encode())
+            line = await asyncio.wait_for(reader.readline(), LOOKUP_TIMEOUT)
+            track = json.loads(line).get("track") if line else None
+            if track is not None:
+                self.data = track
+            self.fetched_at = time.monotonic()
+        except Exception as e:
+            logger.error(f"Error fetching track data from the track feed: {e}")
+        finally:
+            if writer is not None:
+                writer.close()
+        self.latency.observe(time.monotonic() - started)
+        return self.data
@@ -1,25 +1,103 @@
+import asyncio
+import multiprocessing
 import os
 from dotenv import load_dotenv
 import sys
+import time
 
-from bot.bot import RadioMonashBot
+from bot.bot import RadioMonashBot, ShardedRadioMonashBot
 from bot.utils.ffmpeg import check_and_install_ffmpeg
-from bot.utils.logger import get_logger
+from bot.utils.logger import configure_logging, get_logger
+from bot.utils.metrics import DEFAULT_PORT as DEFAULT_METRICS_PORT
+from bot.utils.stations import load_stations
+from bot.utils.trackfeed import DEFAULT_HOST, DEFAULT_PORT, TrackFeedServer
 
 logger = get_logger("Main")
 
+# Discord allows one shard to identify every 5 seconds by default.
+IDENTIFY_INTERVAL = 5
+CLUSTER_CHECK_INTERVAL = 5
+
+def shard_ranges(shard_count: int, processes: int) -> list:
+    """Split shard IDs into contiguous ranges, one per process."""
+    base, extra = divmod(shard_count, processes)
+    ranges, start = [], 0
+    for index in range(processes):
+        size = base + (1 if index < extra else 0)
+        ranges.append(list(range(start, start + size)))
+        start += size
+    return ranges
+
+def run_shard_process(token: str, shard_ids: list, shard_count: int, track_feed: str, sync_commands: bool,
+                      metrics_port: int):
+    """Entry point of one cluster process."""
+    bot = ShardedRadioMonashBot(
+        shard_ids=shard_ids, shard_count=shard_count, track_feed=track_feed, sync_commands=sync_commands,
+        metrics_port=metrics_port
+    )
+    bot.run(token, log_handler=None)
+
+async def run_cluster(token: str, processes: int, shard_count: int):
+    """Poll track metadata here once per station and keep one bot process alive per shard range."""
+    port = int(os.getenv("RADBOT_TRACK_FEED_PORT", DEFAULT_PORT))
+    # Each cluster process serves its metrics on the next port up.
+    metrics_port = int(os.getenv("RADBOT_METRICS_PORT", DEFAULT_METRICS_PORT))
+    feed = TrackFeedServer({key: config.track_url for key, config in load_stations().items()}, port=port)
+    await feed.start()
+    context = multiprocessing.get_context("spawn")
+    ranges = shard_ranges(shard_count, processes)
+    workers = [None] * processes
+    try:
+        while True:
+            for index, shard_ids in enumerate(ranges):
+                process = workers[index]
+                if process is not None and process.is_alive():
+                    continue
+                if process is not None:
+                    logger.warning(f"Cluster process {index} exited with code {process.exitcode}, restarting")
+                process = context.Process(
+                    target=run_shard_process,
+                    args=(token, shard_ids, shard_count, f"{DEFAULT_HOST}:{port}", index == 0,
+                          metrics_port + index if metrics_port else 0),
+                    name=f"radbot-cluster-{index}"
+                )
+                process.start()
+                workers[index] = process
+                logger.info(f"Started cluster process {index} with shards {shard_ids}")
+                # Stagger processes so their shards do not all identify at once.
+                await asyncio.sleep(IDENTIFY_INTERVAL * len(shard_ids))
+            await asyncio.sleep(CLUSTER_CHECK_INTERVAL)
+    finally:
+        for process in workers:
+            if process is not None and process.is_alive():
+                process.terminate()
+        await feed.close()
+
 def main():
     load_dotenv()
+    # Pick up RADBOT_LOG_* settings from .env now that it has been loaded.
+    configure_logging()
+    probe_started = time.monotonic()
     if not check_and_install_ffmpeg():
-        logger.critical("FFmpeg is required but could not be installed automatically. Please install FFmpeg manually.")
+        logger.critical("A working FFmpeg with HTTPS support is required but could not be set up automatically. "
+                        "Please install FFmpeg manually.")
         sys.exit("ERROR: FFmpeg is required but could not be installed. Please install FFmpeg manually.")
+    logger.info(f"FFmpeg check took {time.monotonic() - probe_started:.2f}s")
     
     token = os.getenv("DISCORD_TOKEN")
     if not token:
         logger.critical("No Discord token found in environment variables!")
         sys.exit("ERROR: DISCORD_TOKEN environment variable not set!")
     
+    processes = int(os.getenv("RADBOT_PROCESSES", "1"))
     try:
+        if processes > 1:
+            shard_count = int(os.getenv("RADBOT_SHARD_COUNT", str(processes)))
+            if shard_count < processes:
+                sys.exit("ERROR: RADBOT_SHARD_COUNT must be at least RADBOT_PROCESSES!")
+            logger.info(f"Starting Radio Monash cluster with {processes} processes and {shard_count} shards...")
+            asyncio.run(run_cluster(token, processes, shard_count))
+            return
         logger.info("Starting Radio Monash Discord bot...")
         bot = RadioMonashBot()
         bot.run(token, log_handler=None)
@@ -0,0 +1,103 @@
+import threading
+import time
+
+import pytest
+
+from bot.utils import broadcast
+from bot.utils.broadcast import RadioBroadcast, snap_volume_level
+from bot.utils.ringbuffer import SharedFrameRing
+
+class _FakePool:
+    """Stands in for EncoderPool so worker-mode rings can be exercised without spawning processes."""
+
+    def __init__(self, workers, pcm_ring):
+        self.keys = set()
+
+    def add(self, key, ring):
+        self.keys.add(key)
+
+    def remove(self, key):
+        self.keys.discard(key)
+
+    def check(self):
+        return 0
+
+    def close(self):
+        pass
+
+def _broadcast(monkeypatch, **options) -> RadioBroadcast:
+    """A broadcast whose ingest never starts, so tests can write frames into its rings by hand."""
+    monkeypatch.setattr(broadcast, "EncoderPool", _FakePool)
+    instance = RadioBroadcast("http://127.0.0.1:1/test", **options)
+    monkeypatch.setattr(instance, "_start", lambda: setattr(instance, "_running", True))
+    return instance
+
+def _read_in_thread(instance, source, timeout=2.0):
+    result = {}
+
+    def read():
+        try:
+            result["frame"] = instance.frame_at(source, timeout)
+        except Exception as e:
+            result["error"] = e
+
+    thread = threading.Thread(target=read)
+    thread.start()
+    # Let the reader reach the wait at the live edge.
+    time.sleep(0.1)
+    return thread, result
+
+def test_detach_wakes_a_waiting_reader_before_its_shared_ring_is_closed(monkeypatch):
+    instance = _broadcast(monkeypatch, encode_workers=1)
+    source = instance.create_source(0.5)
+    ring = source._stream.ring
+    assert isinstance(ring, SharedFrameRing)
+
+    thread, result = _read_in_thread(instance, source)
+    instance.detach(source)
+    thread.join(timeout=2)
+
+    assert not thread.is_alive()
+    assert result == {"frame": None}
+    instance.close()
+
+def test_retune_during_a_pending_read_keeps_the_new_cursor(monkeypatch):
+    instance = _broadcast(monkeypatch)
+    source = instance.create_source(0.5)
+    old_ring = source._stream.ring
+    for _ in range(1000):
+        old_ring.write(b"old")
+    source._position = old_ring.head
+
+    thread, result = _read_in_thread(instance, source)
+    source.volume = 0.7
+    thread.join(timeout=2)
+
+    assert result == {"frame": None}
+    assert source._stream.volume == 0.7
+    assert source._position == source._stream.ring.head == 0
+    instance.close()
+
+def test_underrun_conceals_until_the_target_depth_is_rebuilt(monkeypatch):
+    instance = _broadcast(monkeypatch, target_depth=3)
+    source = instance.create_source(0.5)
+    ring = source._stream.ring
+
+    frames = [instance.frame_at(source, timeout=0.01)]
+    for index in range(4):
+        ring.write(b"frame%d" % index)
+        frames.append(instance.frame_at(source, timeout=0.01))
+
+    assert frames == [None, None, None, b"frame0", b"frame1"]
+    assert instance.underruns == 1
+    instance.close()
+
+def test_invalid_jitter_settings_are_rejected():
+    with pytest.raises(ValueError):
+        RadioBroadcast("http://127.0.0.1:1/test", target_depth=broadcast.BUFFER_FRAMES)
+    with pytest.raises(ValueError):
+        RadioBroadcast("http://127.0.0.1:1/test", conceal="loud")
+
+@pytest.mark.parametrize("level, snapped", [(0, 0), (1, 10), (5, 10), (14, 10), (15, 20), (25, 30), (45, 50), (100, 100)])
+def test_snap_volume_level_rounds_half_up(level, snapped):
+    assert snap_volume_level(level) == snapped